@@ -0,0 +1,7 @@
+"""CloudCradle - Oracle Cloud Infrastructure Terraform Setup Tool.
+
+Python implementation of the OCI Always Free Tier setup workflow.
+See setup_oci_terraform.sh for the original Bash implementation.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,6 @@
+"""Entry point for ``python -m oci_terraform_setup``."""
+
+from oci_terraform_setup.cli import main
+
+if __name__ == "__main__":
+    main()
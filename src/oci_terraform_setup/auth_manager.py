@@ -0,0 +1,175 @@
+"""OCI authentication management.
+
+Wraps the OCI config file and browser-based session authentication for
+the quick-setup flow (see :mod:`oci_terraform_setup.cli`).
+"""
+
+import base64
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class OCIAuthManager:
+    """Manage OCI credentials and session validity."""
+
+    def __init__(self, config_file: Optional[str] = None,
+                 profile: str = "DEFAULT") -> None:
+        self.config_file = config_file or os.path.expanduser("~/.oci/config")
+        self.profile = profile
+        self._cfg_cache: Optional[Dict[str, Any]] = None
+        self._cfg_mtime: float = 0.0
+        self._valid_until: float = 0.0
+        self._identity_client: Optional["oci.identity.IdentityClient"] = None
+
+    def config_exists(self) -> bool:
+        return Path(self.config_file).exists()
+
+    def get_config(self) -> Dict[str, Any]:
+        """Parse and return the OCI SDK configuration.
+
+        The parsed dict is cached and invalidated by mtime, so repeated
+        accesses do not re-read the file; re-authentication rewrites the
+        config and bumps the mtime, which refreshes the cache naturally.
+        """
+        import oci
+
+        try:
+            mtime = os.stat(self.config_file).st_mtime
+        except OSError:
+            mtime = 0.0
+        if self._cfg_cache is None or mtime != self._cfg_mtime:
+            self._cfg_cache = oci.config.from_file(self.config_file,
+                                                   self.profile)
+            self._cfg_mtime = mtime
+        return self._cfg_cache
+
+    def get_signer(self) -> Optional["oci.auth.signers.SecurityTokenSigner"]:
+        """Build a security token signer if the config uses session auth."""
+        import oci
+
+        config = self.get_config()
+        token_file = config.get("security_token_file")
+        if not token_file:
+            return None
+        token = Path(token_file).expanduser().read_text().strip()
+        private_key = oci.signer.load_private_key_from_file(config["key_file"])
+        return oci.auth.signers.SecurityTokenSigner(token, private_key)
+
+    def identity_client(self) -> "oci.identity.IdentityClient":
+        """Return the shared IdentityClient, building it on first use.
+
+        Each client constructor sets up its own HTTPS session, so reusing
+        one across validity probes and user-info lookups keeps a single
+        connection pool alive instead of re-handshaking per call.
+        """
+        import oci
+
+        if self._identity_client is None:
+            config = self.get_config()
+            signer = self.get_signer()
+            if signer is not None:
+                self._identity_client = oci.identity.IdentityClient(
+                    config, signer=signer)
+            else:
+                self._identity_client = oci.identity.IdentityClient(config)
+        return self._identity_client
+
+    def is_session_valid_fast(self) -> Optional[bool]:
+        """Decide session validity from the token's own expiry claim.
+
+        Session tokens are JWTs, so the ``exp`` claim answers the common
+        case without a network round-trip.  Returns ``None`` when there
+        is no token or it cannot be parsed (e.g. API-key auth), in which
+        case callers should fall back to a real API probe.
+        """
+        try:
+            token_file = self.get_config().get("security_token_file")
+            if not token_file:
+                return None
+            token = Path(token_file).expanduser().read_text().strip()
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+            exp = int(claims["exp"])
+        except Exception:
+            return None
+        return exp - time.time() > 60
+
+    def is_session_valid(self) -> bool:
+        """Check whether the current credentials can reach the API."""
+        # Credentials valid moments ago are still valid; skip re-probing
+        # for a minute so back-to-back OCI operations pay for one check.
+        if time.monotonic() < self._valid_until:
+            return True
+        fast = self.is_session_valid_fast()
+        if fast is None:
+            try:
+                self.identity_client().list_regions()
+                fast = True
+            except Exception:
+                fast = False
+        if fast:
+            self._valid_until = time.monotonic() + 60
+        return fast
+
+    def get_user_info(self) -> Dict[str, Any]:
+        """Return tenancy/user details for display purposes."""
+        config = self.get_config()
+        tenancy = self.identity_client().get_tenancy(config["tenancy"]).data
+        return {
+            "tenancy_name": tenancy.name,
+            "tenancy_ocid": config["tenancy"],
+            "region": config.get("region", ""),
+            "home_region_key": tenancy.home_region_key,
+        }
+
+    def _reset_cached_auth(self) -> None:
+        """Drop state derived from the old credentials after re-auth."""
+        self._identity_client = None
+        self._valid_until = 0.0
+
+    @staticmethod
+    def _run_streamed(cmd) -> int:
+        """Run *cmd*, echoing output live.
+
+        ``oci session authenticate`` prints the login URL long before it
+        exits; buffering with capture_output would leave the user staring
+        at a silent prompt until the browser flow finished.
+        """
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, bufsize=1,
+                                text=True)
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            print(line, end="", flush=True)
+        return proc.wait()
+
+    def authenticate_with_browser(self, region: str) -> bool:
+        """Run ``oci session authenticate`` for browser-based login."""
+        returncode = self._run_streamed(
+            ["oci", "session", "authenticate",
+             "--profile-name", self.profile,
+             "--region", region])
+        if returncode == 0:
+            self._reset_cached_auth()
+            return True
+        return False
+
+    def refresh_session(self) -> bool:
+        """Refresh an existing security token session."""
+        returncode = self._run_streamed(
+            ["oci", "session", "refresh", "--profile", self.profile])
+        if returncode == 0:
+            self._reset_cached_auth()
+            return True
+        return False
+
+    def setup_config_if_missing(self, region: str) -> bool:
+        """Authenticate if no usable configuration exists yet."""
+        if self.config_exists() and self.is_session_valid():
+            return True
+        return self.authenticate_with_browser(region)
@@ -0,0 +1,302 @@
+"""Command-line interface.
+
+``oci-terraform-setup`` runs the full guided workflow ported from
+``setup_oci_terraform.sh``.  ``--quick`` runs a minimal non-interactive
+flow (authenticate, fetch account info, generate keys and variables)
+useful when the Terraform files already exist.
+"""
+
+import gzip
+import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import click
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from rich.console import Console
+
+from oci_terraform_setup import setup
+from oci_terraform_setup.auth_manager import OCIAuthManager
+from oci_terraform_setup.oci_client import OCIClient
+
+_CONSOLE = None
+
+
+def _console() -> Console:
+    """Build the shared Console on first use, not at import."""
+    global _CONSOLE
+    if _CONSOLE is None:
+        _CONSOLE = Console()
+    return _CONSOLE
+
+
+AMD_SHAPE = "VM.Standard.E2.1.Micro"
+ARM_SHAPE = "VM.Standard.A1.Flex"
+
+# Plain interpolation, no loops or conditionals, so str.format_map does
+# the job without a template engine (literal HCL braces are doubled;
+# same convention as the templates in setup.py).
+_VARS_TPL = '''# Generated by oci-terraform-setup on {generated_at}
+locals {{
+  tenancy_ocid        = "{tenancy_ocid}"
+  region              = "{region}"
+  availability_domain = "{availability_domain}"
+  ssh_public_key      = file("${{path.module}}/ssh_keys/{ssh_key_name}.pub")
+
+  ubuntu_image_ocid     = "{ubuntu_image_ocid}"
+  ubuntu_arm_image_ocid = "{ubuntu_arm_image_ocid}"
+}}
+'''
+
+
+def _stat_or_none(path: Path) -> "os.stat_result | None":
+    """Stat *path* once, returning None when it does not exist.
+
+    exists()/is_dir() pairs cost a syscall each; one stat answers both.
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _generate_keypair() -> "tuple[bytes, bytes]":
+    """Generate one Ed25519 keypair, returning (private, public) bytes.
+
+    Module-level and argument-free so bulk rotation could farm it out to
+    a ProcessPoolExecutor; for the single key the quick flow needs,
+    Ed25519 generation is sub-millisecond and runs inline.
+    """
+    key = ed25519.Ed25519PrivateKey.generate()
+    private_bytes = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.OpenSSH,
+        encryption_algorithm=serialization.NoEncryption())
+    public_bytes = key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH)
+    return private_bytes, public_bytes
+
+
+def _atomic_write(path: Path, data: bytes, mode: int) -> None:
+    """Write *data* to *path* with *mode* set from creation.
+
+    A write_bytes-then-chmod pair briefly leaves the file at the default
+    umask; opening with the final mode closes that window and drops the
+    extra syscall.  fchmod covers the case where the file already exists
+    and O_CREAT's mode argument is ignored.
+    """
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        os.fchmod(fd, mode)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+class OCITerraformSetup:
+    """Quick non-interactive setup: auth, account info, keys, variables."""
+
+    def __init__(self, work_dir: str = ".") -> None:
+        self.work_dir = Path(work_dir).resolve()
+        self.auth_manager = OCIAuthManager()
+        self.oci_client = OCIClient(self.auth_manager)
+        self.oci_info = {}
+        self.ssh_key_name = "id_ed25519"
+        # Built once; these are re-derived only if the legacy-key
+        # fallback renames the pair.
+        self._ssh_dir = self.work_dir / "ssh_keys"
+        self._priv_path = self._ssh_dir / self.ssh_key_name
+        self._pub_path = self._ssh_dir / f"{self.ssh_key_name}.pub"
+        self._vars_path = self.work_dir / "terraform.auto.tfvars.tf"
+
+    def run(self) -> bool:
+        _console().print("[bold cyan]OCI Terraform quick setup[/bold cyan]")
+        if not self._setup_oci_authentication():
+            return False
+        if not self._fetch_oci_info():
+            return False
+        if not self._generate_ssh_keys():
+            return False
+        if not self._create_terraform_vars():
+            return False
+        if not self._verify_setup():
+            return False
+        # One print per phase summary, not three: each Rich print takes
+        # the console lock and flushes the stream.
+        _console().print("[green]Authentication verified[/green]\n"
+                         "[green]Terraform variables written[/green]\n"
+                         "[green]Quick setup complete - "
+                         "run 'terraform init'[/green]")
+        return True
+
+    def _setup_oci_authentication(self) -> bool:
+        _console().print("[blue]Checking OCI authentication...[/blue]")
+        region = os.getenv("OCI_AUTH_REGION") or setup.default_region_for_host()
+        if not self.auth_manager.setup_config_if_missing(region):
+            _console().print("[red]OCI authentication failed[/red]")
+            return False
+        if not self.auth_manager.is_session_valid():
+            _console().print("[yellow]Session expired - re-authenticating[/yellow]")
+            if not self.auth_manager.authenticate_with_browser(region):
+                _console().print("[red]Re-authentication failed[/red]")
+                return False
+        return True
+
+    def _fetch_oci_info(self) -> bool:
+        _console().print("[blue]Fetching OCI account information...[/blue]")
+        try:
+            # Four independent OCI round-trips; overlap them so the phase
+            # costs one RTT instead of four.
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                user_future = executor.submit(self.auth_manager.get_user_info)
+                domains_future = executor.submit(
+                    self.oci_client.get_availability_domains)
+                amd_future = executor.submit(
+                    self.oci_client.get_latest_ubuntu_image, AMD_SHAPE)
+                arm_future = executor.submit(
+                    self.oci_client.get_latest_ubuntu_image, ARM_SHAPE)
+                user_info = user_future.result()
+                domains = domains_future.result()
+                amd_image = amd_future.result()
+                arm_image = arm_future.result()
+        except Exception as exc:
+            _console().print(f"[red]Failed to fetch account info: {exc}[/red]")
+            return False
+        if not domains:
+            _console().print("[red]No availability domains found[/red]")
+            return False
+        self.oci_info = {
+            "tenancy_ocid": user_info["tenancy_ocid"],
+            "region": user_info["region"],
+            "availability_domain": domains[0],
+            "ubuntu_image_ocid": amd_image or "",
+            "ubuntu_arm_image_ocid": arm_image or "",
+        }
+        return True
+
+    def _generate_ssh_keys(self) -> bool:
+        _console().print("[blue]Generating SSH keys...[/blue]")
+        self._ssh_dir.mkdir(mode=0o700, exist_ok=True)
+        if _stat_or_none(self._priv_path) is not None:
+            return True
+        # Keep working with keypairs generated by older versions.
+        if _stat_or_none(self._ssh_dir / "id_rsa") is not None:
+            self.ssh_key_name = "id_rsa"
+            self._priv_path = self._ssh_dir / "id_rsa"
+            self._pub_path = self._ssh_dir / "id_rsa.pub"
+            return True
+
+        private_bytes, public_bytes = _generate_keypair()
+        _atomic_write(self._priv_path, private_bytes, 0o600)
+        _atomic_write(self._pub_path,
+                      public_bytes + b" oci-free-tier\n", 0o644)
+        return True
+
+    def _rotate_backups(self) -> None:
+        """Bound the ``.bak.*`` set left by repeated runs.
+
+        Keeps the newest five backups, gzip-compresses all but the most
+        recent of those, and deletes anything older; without this every
+        run adds a file and the working directory grows forever.
+        """
+        backups = sorted(self.work_dir.glob("terraform.auto.tfvars.tf.bak.*"))
+        for stale in backups[:-5]:
+            stale.unlink()
+        for old in backups[-5:-1]:
+            if old.suffix == ".gz":
+                continue
+            with open(old, "rb") as src, gzip.open(
+                    f"{old}.gz", "wb", compresslevel=1) as dst:
+                shutil.copyfileobj(src, dst)
+            old.unlink()
+
+    def _create_terraform_vars(self) -> bool:
+        _console().print("[blue]Writing Terraform variables...[/blue]")
+        variables_file = self._vars_path
+        now = datetime.now()
+        try:
+            os.replace(variables_file,
+                       f"{variables_file}.bak.{now.strftime('%Y%m%d_%H%M%S')}")
+        except FileNotFoundError:
+            pass
+        self._rotate_backups()
+
+        context = dict(self.oci_info,
+                       generated_at=now.strftime("%Y-%m-%d %H:%M:%S"),
+                       ssh_key_name=self.ssh_key_name)
+        # Encode once and write the bytes directly, skipping the TextIO
+        # wrapper write_text would layer on; same style as the generated
+        # file writes in setup.py.
+        variables_file.write_bytes(_VARS_TPL.format_map(context)
+                                   .encode("utf-8"))
+        return True
+
+    def _verify_setup(self) -> bool:
+        _console().print("[blue]Verifying setup...[/blue]")
+        dir_st = _stat_or_none(self._ssh_dir)
+        if dir_st is None:
+            _console().print("[red]ssh_keys directory missing[/red]")
+            return False
+        if not stat.S_ISDIR(dir_st.st_mode):
+            _console().print("[red]ssh_keys is not a directory[/red]")
+            return False
+        if _stat_or_none(self._priv_path) is None:
+            _console().print("[red]SSH private key missing[/red]")
+            return False
+        if _stat_or_none(self._pub_path) is None:
+            _console().print("[red]SSH public key missing[/red]")
+            return False
+        if not self.auth_manager.is_session_valid():
+            _console().print("[red]OCI session is no longer valid[/red]")
+            return False
+        return True
+
+
+@click.command()
+@click.option("--quick", is_flag=True,
+              help="Run the minimal non-interactive setup flow.")
+@click.option("--work-dir", default=".", show_default=True,
+              help="Directory for generated Terraform files.")
+@click.option("--non-interactive", is_flag=True,
+              help="Never prompt; accept defaults.")
+@click.option("--auto-deploy", is_flag=True,
+              help="Apply the Terraform plan without confirmation.")
+@click.option("--parallelism", type=int, default=None,
+              help="Concurrent operations for terraform plan/apply.")
+@click.option("--no-cache", is_flag=True,
+              help="Ignore the on-disk inventory cache and rescan OCI.")
+@click.option("--cache-ttl", type=int, default=None,
+              help="Inventory cache lifetime in seconds (0 disables).")
+def main(quick: bool, work_dir: str, non_interactive: bool,
+         auto_deploy: bool, parallelism: int, no_cache: bool,
+         cache_ttl: int) -> None:
+    """Set up OCI Always Free Tier infrastructure with Terraform."""
+    overrides = {}
+    if non_interactive:
+        overrides["non_interactive"] = True
+    if auto_deploy:
+        overrides["auto_deploy"] = True
+    if parallelism:
+        overrides["tf_parallelism"] = parallelism
+    if no_cache:
+        overrides["inventory_cache_ttl"] = 0
+    elif cache_ttl is not None:
+        overrides["inventory_cache_ttl"] = cache_ttl
+    if overrides:
+        setup.override_settings(**overrides)
+
+    if quick:
+        ok = OCITerraformSetup(work_dir).run()
+        raise SystemExit(0 if ok else 1)
+
+    os.chdir(work_dir)
+    raise SystemExit(setup.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""High-level OCI API client used by the quick-setup flow."""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from oci_terraform_setup import setup
+from oci_terraform_setup.auth_manager import OCIAuthManager
+
+# Ubuntu image OCIDs only change when Canonical publishes a new build,
+# so cached lookups stay correct for much longer than inventory data.
+_IMAGE_CACHE_TTL = 86400
+
+
+class OCIClient:
+    """Thin convenience wrapper over the OCI SDK service clients."""
+
+    def __init__(self, auth_manager: Optional[OCIAuthManager] = None) -> None:
+        self.auth_manager = auth_manager or OCIAuthManager()
+        self._clients: Dict[str, Any] = {}
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return self.auth_manager.get_config()
+
+    def _client(self, name: str, factory) -> Any:
+        client = self._clients.get(name)
+        if client is None:
+            signer = self.auth_manager.get_signer()
+            if signer is not None:
+                client = factory(self.config, signer=signer)
+            else:
+                client = factory(self.config)
+            self._clients[name] = client
+        return client
+
+    @property
+    def identity(self) -> "oci.identity.IdentityClient":
+        # Shared with the auth manager's validity/user-info probes.
+        return self.auth_manager.identity_client()
+
+    @property
+    def compute(self) -> "oci.core.ComputeClient":
+        import oci
+
+        return self._client("compute", oci.core.ComputeClient)
+
+    @property
+    def network(self) -> "oci.core.VirtualNetworkClient":
+        import oci
+
+        return self._client("network", oci.core.VirtualNetworkClient)
+
+    def get_availability_domains(self) -> List[str]:
+        """List availability domain names in the tenancy."""
+        tenancy = self.config["tenancy"]
+        response = self.identity.list_availability_domains(tenancy)
+        return [ad.name for ad in response.data]
+
+    def _image_cache_file(self, shape: str, version: str) -> Path:
+        region = self.config.get("region", "unknown")
+        return (Path.home() / ".cache" / "oci_terraform_setup" /
+                f"images-{region}-{shape}-{version}.json")
+
+    def get_ubuntu_images(self, shape: str,
+                          version: str = "22.04") -> List[Dict[str, Any]]:
+        """Find Ubuntu images compatible with *shape*, newest first.
+
+        The ``shape`` and ``operating_system_version`` filters are applied
+        server-side, so one small page replaces a full catalogue walk and
+        the display-name scans the filters used to need.  Results are
+        cached on disk per region/shape for a day (the image catalogue is
+        the slowest call in the quick flow); ``--no-cache`` bypasses it.
+        """
+        cache_file = self._image_cache_file(shape, version)
+        caching = setup.get_settings().inventory_cache_ttl > 0
+        if caching:
+            try:
+                entry = json.loads(cache_file.read_bytes())
+                if time.time() - entry["ts"] < _IMAGE_CACHE_TTL:
+                    return entry["images"]
+            except (OSError, ValueError, KeyError):
+                pass
+        response = self.compute.list_images(
+            compartment_id=self.config["tenancy"],
+            operating_system="Canonical Ubuntu",
+            operating_system_version=version,
+            shape=shape,
+            sort_by="TIMECREATED",
+            sort_order="DESC",
+            lifecycle_state="AVAILABLE")
+        import oci
+
+        images = [oci.util.to_dict(image) for image in response.data]
+        if caching:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(
+                    json.dumps({"ts": time.time(), "images": images}))
+            except OSError:
+                pass
+        return images
+
+    def get_latest_ubuntu_image(self, shape: str) -> Optional[str]:
+        """Return the OCID of the newest matching Ubuntu image."""
+        images = self.get_ubuntu_images(shape)
+        if not images:
+            return None
+        return images[0]["id"]
@@ -0,0 +1,2916 @@
+"""OCI Always Free Tier setup workflow.
+
+Python port of ``setup_oci_terraform.sh``: authenticates against Oracle
+Cloud Infrastructure, inventories existing Always Free resources,
+generates Terraform configuration for the maximum free tier footprint and
+drives the Terraform workflow (init/plan/apply) with Out-of-Capacity
+retry handling.
+
+OCI API calls go through the native OCI Python SDK via persistent,
+lazily-constructed service clients (see ``oci_call``).  ``oci_cmd`` is
+kept as a compatibility shim that accepts the old CLI-style command
+strings and dispatches them to the SDK, so the control flow mirrors the
+Bash script closely.
+"""
+
+import atexit
+import configparser
+import dataclasses
+import json
+import os
+import platform
+import random
+import threading
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+
+# hashlib, tempfile, urllib.request, webbrowser and zipfile are imported
+# lazily inside the cold paths that need them (installers, metadata
+# probe, browser handoff) to keep process startup lean.
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import jmespath
+from rich.console import Console, Group
+
+# orjson parses large OCI list responses several times faster than the
+# stdlib; fall back transparently when it is not installed.
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+from rich.prompt import Confirm, IntPrompt, Prompt
+from rich.table import Table
+
+# Avoid the 100-continue handshake on PUT/POST requests made by the SDK.
+os.environ.setdefault("OCI_PYSDK_USING_EXPECT_HEADER", "FALSE")
+
+# ---------------------------------------------------------------------------
+# Configuration (environment-driven, mirroring the Bash script)
+# ---------------------------------------------------------------------------
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false") == "true"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment-derived configuration, parsed exactly once per run.
+
+    Frozen so nothing mutates configuration mid-workflow; CLI flags
+    layer on top through :func:`override_settings` before work starts.
+    """
+
+    non_interactive: bool
+    auto_use_existing: bool
+    auto_deploy: bool
+    skip_config: bool
+    debug: bool
+    force_reauth: bool
+    oci_config_file: str
+    oci_profile: str
+    oci_auth_region: str
+    oci_cmd_timeout: int
+    oci_max_qps: float
+    retry_max_attempts: int
+    retry_base_delay: int
+    retry_max_delay: int
+    tf_version: Optional[str]
+    tf_backend: str
+    tf_backend_bucket: str
+    tf_backend_region: str
+    tf_backend_state_key: str
+    tf_backend_endpoint: str
+    tf_backend_create_bucket: bool
+    tf_parallelism: int
+    inventory_cache_ttl: int
+
+
+_SETTINGS: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Return the process-wide settings, building them on first use."""
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = Settings(
+            non_interactive=_env_flag("NON_INTERACTIVE"),
+            auto_use_existing=_env_flag("AUTO_USE_EXISTING"),
+            auto_deploy=_env_flag("AUTO_DEPLOY"),
+            skip_config=_env_flag("SKIP_CONFIG"),
+            debug=_env_flag("DEBUG"),
+            force_reauth=_env_flag("FORCE_REAUTH"),
+            oci_config_file=os.getenv("OCI_CONFIG_FILE",
+                                      os.path.expanduser("~/.oci/config")),
+            oci_profile=os.getenv("OCI_PROFILE", "DEFAULT"),
+            oci_auth_region=os.getenv("OCI_AUTH_REGION", ""),
+            oci_cmd_timeout=int(os.getenv("OCI_CMD_TIMEOUT", "20")),
+            oci_max_qps=float(os.getenv("OCI_MAX_QPS", "10")),
+            retry_max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "8")),
+            retry_base_delay=int(os.getenv("RETRY_BASE_DELAY", "15")),
+            retry_max_delay=int(os.getenv("RETRY_MAX_DELAY", "300")),
+            tf_version=os.getenv("TF_VERSION"),
+            tf_backend=os.getenv("TF_BACKEND", ""),
+            tf_backend_bucket=os.getenv("TF_BACKEND_BUCKET", "terraform-state"),
+            tf_backend_region=os.getenv("TF_BACKEND_REGION", ""),
+            tf_backend_state_key=os.getenv("TF_BACKEND_STATE_KEY",
+                                           "oci-free-tier/terraform.tfstate"),
+            tf_backend_endpoint=os.getenv("TF_BACKEND_ENDPOINT", ""),
+            tf_backend_create_bucket=_env_flag("TF_BACKEND_CREATE_BUCKET"),
+            # OCI resource graphs are API-latency-bound; 3x cores keeps
+            # more provider RPCs in flight than the terraform default of 10.
+            tf_parallelism=int(os.getenv(
+                "TF_PARALLELISM", str(max(16, 3 * (os.cpu_count() or 1))))),
+            inventory_cache_ttl=int(os.getenv("CLOUDCRADLE_CACHE_TTL", "300")),
+        )
+    return _SETTINGS
+
+
+def override_settings(**overrides) -> Settings:
+    """Apply CLI-flag overrides on top of the environment settings."""
+    global _SETTINGS
+    _SETTINGS = dataclasses.replace(get_settings(), **overrides)
+    return _SETTINGS
+
+# Always Free tier limits
+MAX_AMD_INSTANCES = 2
+AMD_SHAPE = "VM.Standard.E2.1.Micro"
+MAX_ARM_OCPUS = 4
+MAX_ARM_MEMORY_GB = 24
+ARM_SHAPE = "VM.Standard.A1.Flex"
+MAX_STORAGE_GB = 200
+MIN_BOOT_VOLUME_GB = 47
+MAX_ARM_INSTANCES = 4
+MAX_VCNS = 2
+
+console = Console()
+
+
+# ---------------------------------------------------------------------------
+# Output helpers
+# ---------------------------------------------------------------------------
+
+# Status lines can be batched across a fast path (one console write and
+# flush instead of one per line, which adds up on WSL/CI consoles).
+# Errors are never buffered so failures always surface immediately.
+_status_buf: List[str] = []
+_batching = False
+
+
+def _begin_batched_log() -> None:
+    global _batching
+    _batching = True
+
+
+def _flush_log(stop_batching: bool = True) -> None:
+    global _batching
+    if stop_batching:
+        _batching = False
+    if _status_buf:
+        console.print("\n".join(_status_buf))
+        _status_buf.clear()
+
+
+atexit.register(_flush_log)
+
+
+def _emit(markup: str) -> None:
+    if _batching:
+        _status_buf.append(markup)
+    else:
+        console.print(markup)
+
+
+def print_status(message: str) -> None:
+    _emit(f"[blue][INFO][/blue] {message}")
+
+
+def print_success(message: str) -> None:
+    _emit(f"[green][SUCCESS][/green] {message}")
+
+
+def print_warning(message: str) -> None:
+    _emit(f"[yellow][WARNING][/yellow] {message}")
+
+
+def print_error(message: str) -> None:
+    _flush_log()
+    console.print(f"[red][ERROR][/red] {message}")
+
+
+def print_debug(message: str) -> None:
+    if get_settings().debug:
+        _emit(f"[magenta][DEBUG][/magenta] {message}")
+
+
+def print_header(title: str) -> None:
+    # Section boundaries are natural flush points: the previous section's
+    # buffered lines go out in one console write.
+    _flush_log(stop_batching=False)
+    _emit(f"\n[bold cyan]=== {title} ===[/bold cyan]\n")
+
+
+# ---------------------------------------------------------------------------
+# Shared state
+# ---------------------------------------------------------------------------
+
+class OCIConfig:
+    """Values resolved from the OCI config file and API lookups."""
+
+    def __init__(self) -> None:
+        self.tenancy_ocid = ""
+        self.user_ocid = ""
+        self.region = ""
+        self.fingerprint = ""
+        self.availability_domain = ""
+        self.ubuntu_image_ocid = ""
+        self.ubuntu_arm_image_ocid = ""
+        self.ssh_public_key = ""
+        self.ssh_key_name = "id_ed25519"
+        self.auth_method = ""
+
+
+class InstanceConfig:
+    """The instance layout chosen by the user (or auto-selected)."""
+
+    def __init__(self) -> None:
+        self.amd_count = 0
+        self.amd_hostnames: List[str] = []
+        self.arm_count = 0
+        self.arm_hostnames: List[str] = []
+        self.arm_ocpus: List[int] = []
+        self.arm_memory_gbs: List[int] = []
+        self.boot_volume_sizes: List[int] = []
+        self.block_volume_sizes: List[int] = []
+
+
+class ExistingResource:
+    """A discovered OCI resource, tracked so re-runs stay idempotent.
+
+    Slotted: tenancies can hold hundreds of these in the long-lived
+    inventory dicts, and fixed slots beat a per-instance __dict__.
+    """
+
+    __slots__ = ("id", "name", "state", "additional_info",
+                 "ocpus", "memory_gb", "size_gb")
+
+    def __init__(self, id: str, name: str, state: str = "",
+                 additional_info: Optional[Dict[str, Any]] = None) -> None:
+        self.id = id
+        self.name = name
+        self.state = state
+        info = additional_info or {}
+        self.additional_info = info
+        # Fields the aggregation paths hit repeatedly, promoted out of
+        # the dict so hot loops avoid per-access hashing.
+        self.ocpus = int(info.get("ocpus", 0) or 0)
+        self.memory_gb = int(info.get("memory_gb", 0) or 0)
+        self.size_gb = int(info.get("size_gb", 0) or 0)
+
+
+oci_config = OCIConfig()
+instance_config = InstanceConfig()
+
+existing_vcns: Dict[str, ExistingResource] = {}
+existing_subnets: Dict[str, ExistingResource] = {}
+existing_internet_gateways: Dict[str, ExistingResource] = {}
+existing_route_tables: Dict[str, ExistingResource] = {}
+existing_security_lists: Dict[str, ExistingResource] = {}
+existing_amd_instances: Dict[str, ExistingResource] = {}
+existing_arm_instances: Dict[str, ExistingResource] = {}
+existing_boot_volumes: Dict[str, ExistingResource] = {}
+existing_block_volumes: Dict[str, ExistingResource] = {}
+
+available_resources: Dict[str, int] = {
+    "amd_instances": 0,
+    "arm_ocpus": 0,
+    "arm_memory_gb": 0,
+    "storage_gb": 0,
+    "vcns": 0,
+}
+
+
+# ---------------------------------------------------------------------------
+# Utility functions
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def command_exists(name: str) -> bool:
+    """Return True if *name* resolves to an executable on PATH."""
+    return shutil.which(name) is not None
+
+
+@lru_cache(maxsize=None)
+def _path_exe_set() -> frozenset:
+    """Every executable name visible on PATH, collected in a single pass.
+
+    Cheaper than running shutil.which once per tool, which re-walks every
+    PATH directory for each lookup.
+    """
+    names = set()
+    for directory in os.get_exec_path():
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.endswith((".exe", ".cmd", ".bat")):
+                entry = entry.rsplit(".", 1)[0]
+            names.add(entry)
+    return frozenset(names)
+
+
+@lru_cache(maxsize=None)
+def is_wsl() -> bool:
+    """Detect whether we are running under Windows Subsystem for Linux."""
+    try:
+        text = Path("/proc/version").read_text().lower()
+    except OSError:
+        return False
+    return "microsoft" in text or "wsl" in text
+
+
+@lru_cache(maxsize=None)
+def is_windows() -> bool:
+    return sys.platform.startswith("win") or is_wsl()
+
+
+def _read_timezone() -> str:
+    try:
+        return Path("/etc/timezone").read_text().strip()
+    except OSError:
+        try:
+            return os.readlink("/etc/localtime")
+        except OSError:
+            return ""
+
+
+# Timezone fragments -> nearest OCI region, checked in order (most
+# specific first).
+_TZ_REGIONS = [
+    (re.compile(r"london|dublin|lisbon|belfast"), "uk-london-1"),
+    (re.compile(r"europe"), "eu-frankfurt-1"),
+    (re.compile(r"new_york|toronto|detroit|montreal|eastern"), "us-ashburn-1"),
+    (re.compile(r"america|us/"), "us-phoenix-1"),
+    (re.compile(r"tokyo|japan"), "ap-tokyo-1"),
+    (re.compile(r"kolkata|mumbai|calcutta"), "ap-mumbai-1"),
+    (re.compile(r"asia"), "ap-singapore-1"),
+    (re.compile(r"australia|sydney|melbourne"), "ap-sydney-1"),
+]
+
+
+@lru_cache(maxsize=None)
+def default_region_for_host() -> str:
+    """Best-effort guess of a sensible default OCI region for this host."""
+    tz_lower = (os.environ.get("TZ") or _read_timezone()).lower()
+    for pattern, region in _TZ_REGIONS:
+        if pattern.search(tz_lower):
+            return region
+    return "us-ashburn-1"
+
+
+def open_url_best_effort(url: str) -> None:
+    """Try to open *url* in the user's browser, quietly doing nothing on failure.
+
+    Uses the in-process stdlib dispatch except under WSL, where only the
+    Windows side can see a browser.
+    """
+    if not url:
+        return
+    try:
+        if is_wsl():
+            subprocess.run(["cmd.exe", "/c", "start", url], check=False,
+                           capture_output=True)
+        else:
+            import webbrowser
+            webbrowser.open(url, new=2)
+    except OSError:
+        pass
+
+
+def run_command(cmd: Sequence[str], check: bool = False,
+                capture_output: bool = True, timeout: Optional[int] = None,
+                cwd=None) -> subprocess.CompletedProcess:
+    """Run an argv sequence, returning the CompletedProcess.
+
+    Callers must pass a pre-split argument list; naive whitespace
+    splitting of command strings breaks on paths containing spaces.
+    """
+    print_debug(f"Running: {' '.join(cmd)}")
+    return subprocess.run(list(cmd), check=check,
+                          capture_output=capture_output,
+                          text=True, timeout=timeout, cwd=cwd)
+
+
+def run_command_stream(cmd: Sequence[str],
+                       pattern: "re.Pattern",
+                       tail_lines: int = 40) -> Tuple[int, bool, List[str]]:
+    """Run *cmd*, streaming merged output line by line.
+
+    Echoes each line to the console, matches *pattern* as lines arrive,
+    and keeps only the last *tail_lines* lines for error reporting - so
+    a multi-MB terraform log never has to fit in memory at once.
+    Returns ``(returncode, matched, tail)``.
+    """
+    from collections import deque
+
+    print_debug(f"Running (streamed): {' '.join(cmd)}")
+    proc = subprocess.Popen(list(cmd), stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, bufsize=1, text=True)
+    matched = False
+    tail: "deque" = deque(maxlen=tail_lines)
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        line = line.rstrip("\n")
+        console.print(line, markup=False, highlight=False)
+        tail.append(line)
+        if not matched and pattern.search(line):
+            matched = True
+    return proc.wait(), matched, list(tail)
+
+
+_cfg_cache: Dict[str, Tuple[Tuple[int, int, int], configparser.ConfigParser]] = {}
+_cfg_cache_lock = threading.Lock()
+
+
+def _load_oci_config(path: str) -> Optional[configparser.ConfigParser]:
+    """Parse the OCI config at most once per on-disk version.
+
+    The (mtime_ns, size, ino) signature makes the cache self-invalidating
+    and catches both in-place edits (mtime/size) and atomic replacements
+    (inode change) after re-authentication.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _cfg_cache_lock:
+        cached = _cfg_cache.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    with _cfg_cache_lock:
+        _cfg_cache[path] = (sig, parser)
+    return parser
+
+
+def read_oci_config_value(key: str, profile: Optional[str] = None) -> str:
+    """Read a single value from the OCI config file (INI format)."""
+    settings = get_settings()
+    parser = _load_oci_config(os.path.expanduser(settings.oci_config_file))
+    if parser is None:
+        return ""
+    try:
+        return parser.get(profile or settings.oci_profile, key)
+    except (configparser.NoSectionError, configparser.NoOptionError):
+        return ""
+
+
+def read_oci_config_values(keys: Sequence[str],
+                           profile: Optional[str] = None) -> Dict[str, str]:
+    """Read several config values in one pass over the cached parser.
+
+    Missing keys map to "" so callers can unpack unconditionally.
+    """
+    settings = get_settings()
+    parser = _load_oci_config(os.path.expanduser(settings.oci_config_file))
+    values = {key: "" for key in keys}
+    if parser is None:
+        return values
+    section = profile or settings.oci_profile
+    if parser.has_section(section):
+        for key in keys:
+            values[key] = parser.get(section, key, fallback="")
+    return values
+
+
+@lru_cache(maxsize=None)
+def is_instance_principal_available() -> bool:
+    """Check whether the instance metadata service answers (i.e. we are on OCI)."""
+    import urllib.request
+    try:
+        request = urllib.request.Request(
+            "http://169.254.169.254/opc/v2/instance/",
+            headers={"Authorization": "Bearer Oracle"})
+        with urllib.request.urlopen(request, timeout=2) as response:
+            return response.status < 500
+    except Exception:  # noqa: BLE001 - any failure means "not on OCI"
+        return False
+
+
+def confirm_action(prompt: str, default: bool = False) -> bool:
+    """Ask the user for confirmation, honoring NON_INTERACTIVE."""
+    if get_settings().non_interactive:
+        print_status(f"{prompt} -> {'yes' if default else 'no'} (non-interactive)")
+        return default
+    return Confirm.ask(prompt, default=default)
+
+
+def ask_int(prompt: str, default: int, lo: int, hi: int) -> int:
+    """IntPrompt.ask clamped to [lo, hi], honoring NON_INTERACTIVE.
+
+    Non-interactive runs take the default without ever constructing the
+    Rich prompt machinery.
+    """
+    if get_settings().non_interactive:
+        return max(lo, min(default, hi))
+    return max(lo, min(IntPrompt.ask(prompt, default=default), hi))
+
+
+def ask_str(prompt: str, default: str) -> str:
+    """Prompt.ask that short-circuits to the default when NON_INTERACTIVE."""
+    if get_settings().non_interactive:
+        return default
+    return Prompt.ask(prompt, default=default)
+
+
+# ---------------------------------------------------------------------------
+# OCI SDK access
+# ---------------------------------------------------------------------------
+
+class TokenBucket:
+    """Token-bucket rate limiter shared across the discovery thread pool.
+
+    Proactively caps outbound API QPS so parallel discovery stays under
+    the tenancy's per-second limit rather than provoking 429 storms and
+    reactive retry cascades.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = float(rate)
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity,
+                    self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                self._cond.wait((1.0 - self._tokens) / self._rate)
+
+    def __enter__(self) -> "TokenBucket":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_api_bucket: Optional[TokenBucket] = None
+_api_bucket_lock = threading.Lock()
+
+
+def _rate_limiter() -> TokenBucket:
+    global _api_bucket
+    if _api_bucket is None:
+        with _api_bucket_lock:
+            if _api_bucket is None:
+                _api_bucket = TokenBucket(get_settings().oci_max_qps, burst=20)
+    return _api_bucket
+
+
+_oci_clients: Dict[str, Any] = {}
+
+
+def _sdk_config() -> Dict[str, Any]:
+    import oci
+
+    settings = get_settings()
+    return oci.config.from_file(settings.oci_config_file, settings.oci_profile)
+
+
+def _token_signer(cfg: Dict[str, Any]):
+    """Build (once) the security token signer for session-authenticated configs."""
+    import oci
+
+    signer = _oci_clients.get("_signer")
+    if signer is None:
+        token = Path(cfg["security_token_file"]).expanduser().read_text().strip()
+        private_key = oci.signer.load_private_key_from_file(cfg["key_file"])
+        signer = oci.auth.signers.SecurityTokenSigner(token, private_key)
+        _oci_clients["_signer"] = signer
+    return signer
+
+
+def _get_client(service: str):
+    """Return a lazily-constructed, cached SDK client for *service*."""
+    import oci
+
+    client = _oci_clients.get(service)
+    if client is not None:
+        return client
+
+    cfg = _oci_clients.get("_config")
+    if cfg is None:
+        cfg = _sdk_config()
+        _oci_clients["_config"] = cfg
+
+    kwargs: Dict[str, Any] = {
+        "retry_strategy": oci.retry.DEFAULT_RETRY_STRATEGY,
+    }
+    if cfg.get("security_token_file") and oci_config.auth_method != "api_key":
+        kwargs["signer"] = _token_signer(cfg)
+
+    factories = {
+        "compute": oci.core.ComputeClient,
+        "network": oci.core.VirtualNetworkClient,
+        "blockstorage": oci.core.BlockstorageClient,
+        "identity": oci.identity.IdentityClient,
+        "object_storage": oci.object_storage.ObjectStorageClient,
+        "search": oci.resource_search.ResourceSearchClient,
+    }
+    client = factories[service](cfg, **kwargs)
+
+    # Widen the urllib3 pool so concurrent discovery threads reuse
+    # connections instead of queueing on the default pool of 10.
+    from requests.adapters import HTTPAdapter
+
+    client.base_client.session.mount(
+        "https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+    _oci_clients[service] = client
+    return client
+
+
+def reset_oci_clients() -> None:
+    """Drop cached clients/config/values, e.g. after re-authentication."""
+    _oci_clients.clear()
+    _conn_ok_cache.clear()
+    with _cfg_cache_lock:
+        _cfg_cache.clear()
+
+
+def oci_call(service: str, method: str, paginate: bool = False, **kwargs) -> Any:
+    """Invoke an SDK client method and return plain dict/list data."""
+    import oci
+
+    client = _get_client(service)
+    fn = getattr(client, method)
+    with _rate_limiter():
+        if paginate:
+            response = oci.pagination.list_call_get_all_results(fn, **kwargs)
+        else:
+            response = fn(**kwargs)
+    return oci.util.to_dict(response.data)
+
+
+def oci_try(service: str, method: str, paginate: bool = False,
+            **kwargs) -> Optional[Any]:
+    """``oci_call`` that returns None on failure instead of raising.
+
+    Preferred over ``oci_cmd`` for new call sites: no command-string
+    parsing and no JSON round trip through text.
+    """
+    try:
+        return oci_call(service, method, paginate=paginate, **kwargs)
+    except Exception as exc:  # noqa: BLE001 - mirror oci_cmd's catch-all
+        print_debug(f"oci_call: {service}.{method} -> {exc}")
+        return None
+
+
+# Mapping from the old CLI (service, resource, verb) triples to SDK calls.
+_CLI_DISPATCH: Dict[Tuple[str, str, str], Tuple[str, str]] = {
+    ("iam", "region", "list"): ("identity", "list_regions"),
+    ("iam", "tenancy", "get"): ("identity", "get_tenancy"),
+    ("iam", "user", "list"): ("identity", "list_users"),
+    ("iam", "availability-domain", "list"): ("identity", "list_availability_domains"),
+    ("compute", "image", "list"): ("compute", "list_images"),
+    ("compute", "instance", "list"): ("compute", "list_instances"),
+    ("compute", "instance", "get"): ("compute", "get_instance"),
+    ("compute", "vnic-attachment", "list"): ("compute", "list_vnic_attachments"),
+    ("network", "vcn", "list"): ("network", "list_vcns"),
+    ("network", "subnet", "list"): ("network", "list_subnets"),
+    ("network", "internet-gateway", "list"): ("network", "list_internet_gateways"),
+    ("network", "route-table", "list"): ("network", "list_route_tables"),
+    ("network", "security-list", "list"): ("network", "list_security_lists"),
+    ("network", "vnic", "get"): ("network", "get_vnic"),
+    ("bv", "boot-volume", "list"): ("blockstorage", "list_boot_volumes"),
+    ("bv", "volume", "list"): ("blockstorage", "list_volumes"),
+    ("os", "ns", "get"): ("object_storage", "get_namespace"),
+    ("os", "bucket", "get"): ("object_storage", "get_bucket"),
+    ("os", "bucket", "create"): ("object_storage", "create_bucket"),
+}
+
+# CLI flags that carry integer values.
+_INT_FLAGS = ("limit",)
+
+
+def _parse_cli_flags(tokens: List[str]) -> Dict[str, Any]:
+    """Turn ``--flag value ...`` tokens into SDK keyword arguments.
+
+    Values run until the next ``--flag`` so multi-word values (e.g.
+    ``--operating-system Canonical Ubuntu``) survive whitespace splitting.
+    Flags without a value (e.g. ``--all``) become booleans.
+    """
+    kwargs: Dict[str, Any] = {}
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if not token.startswith("--"):
+            i += 1
+            continue
+        name = token[2:].replace("-", "_")
+        value_parts = []
+        i += 1
+        while i < len(tokens) and not tokens[i].startswith("--"):
+            value_parts.append(tokens[i])
+            i += 1
+        if not value_parts:
+            kwargs[name] = True
+        else:
+            value = " ".join(value_parts)
+            kwargs[name] = int(value) if name in _INT_FLAGS else value
+    return kwargs
+
+
+def oci_cmd(command: Union[str, Sequence[str]]) -> Optional[str]:
+    """Execute an OCI CLI-style command via the native SDK.
+
+    Accepts a pre-split argument sequence or a command string, which is
+    tokenized with shlex so quoted values survive.  Returns the JSON
+    response text (``{"data": ...}``, matching the CLI output shape) or
+    ``None`` on failure.  ``session`` subcommands still shell out to the
+    real CLI since they drive interactive browser flows.
+    """
+    import oci
+
+    tokens = shlex.split(command) if isinstance(command, str) else list(command)
+    if tokens and tokens[0] == "session":
+        settings = get_settings()
+        cli = ["oci", "--config-file", settings.oci_config_file,
+               "--profile", settings.oci_profile]
+        result = run_command(cli + tokens, timeout=settings.oci_cmd_timeout * 10)
+        return result.stdout if result.returncode == 0 else None
+
+    key = tuple(tokens[:3])
+    if key not in _CLI_DISPATCH:
+        print_error(f"oci_cmd: unsupported command: {command}")
+        return None
+    service, method = _CLI_DISPATCH[key]
+
+    kwargs = _parse_cli_flags(tokens[3:])
+    paginate = bool(kwargs.pop("all", False))
+    kwargs.pop("output", None)
+
+    try:
+        if method == "create_bucket":
+            details = oci.object_storage.models.CreateBucketDetails(
+                name=kwargs.pop("name"),
+                compartment_id=kwargs.pop("compartment_id"),
+            )
+            data = oci_call(service, method,
+                            namespace_name=kwargs.pop("namespace_name"),
+                            create_bucket_details=details)
+        else:
+            data = oci_call(service, method, paginate=paginate, **kwargs)
+    except oci.exceptions.ServiceError as exc:
+        print_debug(f"oci_cmd: {command} -> {exc.status} {exc.code}")
+        return None
+    except Exception as exc:  # noqa: BLE001 - mirror the CLI's catch-all exit
+        print_debug(f"oci_cmd: {command} -> {exc}")
+        return None
+    return json.dumps({"data": data})
+
+
+@lru_cache(maxsize=256)
+def _jp(query: str):
+    """Compile a JMESPath expression once per distinct query string."""
+    return jmespath.compile(query.lstrip("."))
+
+
+def safe_jq(json_data: Any, query: str, default: Any = "") -> Any:
+    """Evaluate a JMESPath expression (``.data[0].id``) against JSON data.
+
+    Accepts an already-decoded object or raw JSON text; returns *default*
+    when the path does not resolve.  Expressions are compiled once and
+    cached, so repeated queries in the discovery loops are cheap.
+    """
+    if json_data in (None, "", "null"):
+        return default
+    obj = json_data
+    if isinstance(obj, (str, bytes)):
+        try:
+            obj = _loads(obj)
+        except ValueError:
+            return default
+    try:
+        result = _jp(query).search(obj)
+    except jmespath.exceptions.JMESPathError:
+        return default
+    return default if result is None else result
+
+
+# ---------------------------------------------------------------------------
+# Retry helpers
+# ---------------------------------------------------------------------------
+
+# Matches every spelling OCI uses for capacity exhaustion ("Out of
+# capacity", "OutOfHostCapacity", ...) in one case-insensitive scan.
+_OOC_RE = re.compile(r"out[- ]?of[- ]?(?:host[- ]?)?capacity", re.I)
+
+# Errors that will not heal with time - retrying them just burns half an
+# hour of exponential backoff.
+_UNRECOVERABLE_RE = re.compile(
+    r"notauthenticated|notauthorized|invalidparameter"
+    r"|status 40[0134]", re.I)
+
+
+def _is_unrecoverable(output: str) -> bool:
+    """True for auth/parameter failures that retrying cannot fix."""
+    if _OOC_RE.search(output):
+        return False
+    return _UNRECOVERABLE_RE.search(output) is not None
+
+
+# Set by the SIGINT handler while a retry loop is waiting, so a Ctrl-C
+# ends the backoff cleanly instead of raising mid-sleep.
+_retry_cancel = threading.Event()
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Capped full-jitter exponential backoff (attempt counts from 1).
+
+    Full jitter de-synchronizes concurrent runners competing for the
+    same capacity; the cap bounds the tail.
+    """
+    return random.uniform(1, min(cap, base * (2 ** (attempt - 1))))
+
+
+def _wait_or_cancel(seconds: float) -> bool:
+    """Sleep for *seconds*; True when the wait was cancelled via SIGINT."""
+    return _retry_cancel.wait(seconds)
+
+
+def retry_with_backoff(cmd: List[str], max_attempts: Optional[int] = None,
+                       base_delay: Optional[int] = None) -> subprocess.CompletedProcess:
+    """Run *cmd* with jittered exponential backoff.
+
+    Out-of-Capacity errors stay on the retry path; unrecoverable errors
+    (auth, bad parameters) short-circuit immediately.  The jitter keeps
+    concurrent retries from hammering OCI in lockstep.
+    """
+    settings = get_settings()
+    attempts = max_attempts or settings.retry_max_attempts
+    delay = base_delay or settings.retry_base_delay
+    result = None
+    for attempt in range(1, attempts + 1):
+        print_status(f"Attempt {attempt}/{attempts}: {' '.join(cmd)}")
+        result = run_command(cmd)
+        if result.returncode == 0:
+            return result
+        output = (result.stdout or "") + (result.stderr or "")
+        if _is_unrecoverable(output):
+            print_error("Unrecoverable error - not retrying:")
+            console.print(output[-1000:])
+            return result
+        if _OOC_RE.search(output):
+            print_warning(f"Out of capacity reported (attempt {attempt}/{attempts})")
+        else:
+            print_warning(f"Command failed with exit code {result.returncode}")
+        if attempt < attempts:
+            sleep_for = _backoff_delay(attempt, delay,
+                                       settings.retry_max_delay)
+            print_status(f"Retrying in {sleep_for:.0f}s...")
+            if _wait_or_cancel(sleep_for):
+                print_warning("Retry loop cancelled")
+                return result
+    print_error(f"Command failed after {attempts} attempts")
+    return result
+
+
+def run_cmd_with_retries_and_check(cmd: List[str],
+                                   expect_json: bool = False) -> Tuple[Optional[str], bool]:
+    """Run *cmd* via retry_with_backoff, optionally validating JSON output.
+
+    Returns ``(stdout, out_of_capacity)``.
+    """
+    result = retry_with_backoff(cmd)
+    output = (result.stdout or "") + (result.stderr or "")
+    out_of_capacity = _OOC_RE.search(output) is not None
+    if result.returncode != 0:
+        return None, out_of_capacity
+    if expect_json:
+        try:
+            _loads(result.stdout)
+        except ValueError:
+            print_warning("Expected JSON output but got something else")
+            return None, out_of_capacity
+    return result.stdout, out_of_capacity
+
+
+def out_of_capacity_auto_apply(max_attempts: Optional[int] = None,
+                               base_delay: Optional[int] = None) -> bool:
+    """Run ``terraform apply`` repeatedly until Out-of-Capacity clears."""
+    import signal
+
+    settings = get_settings()
+    attempts = max_attempts or settings.retry_max_attempts
+    delay = base_delay or settings.retry_base_delay
+    parallelism = f"-parallelism={settings.tf_parallelism}"
+
+    _retry_cancel.clear()
+    try:
+        previous = signal.signal(
+            signal.SIGINT, lambda signum, frame: _retry_cancel.set())
+    except ValueError:  # not the main thread; plain waits still work
+        previous = None
+
+    try:
+        for attempt in range(1, attempts + 1):
+            print_status(f"terraform apply attempt {attempt}/{attempts}")
+            returncode, out_of_capacity, tail = run_command_stream(
+                ["terraform", "apply", "-auto-approve", parallelism], _OOC_RE)
+            if returncode == 0:
+                print_success("terraform apply succeeded")
+                return True
+            if out_of_capacity:
+                sleep_for = _backoff_delay(attempt, delay,
+                                           settings.retry_max_delay)
+                print_warning(f"Out of capacity - retrying in {sleep_for:.0f}s "
+                              f"(attempt {attempt}/{attempts}, Ctrl-C to stop)")
+                if _wait_or_cancel(sleep_for):
+                    print_warning("Retry loop cancelled")
+                    return False
+            else:
+                print_error("terraform apply failed for a non-capacity reason:")
+                console.print("\n".join(tail), markup=False, highlight=False)
+                return False
+        print_error(f"Still out of capacity after {attempts} attempts")
+        return False
+    finally:
+        if previous is not None:
+            signal.signal(signal.SIGINT, previous)
+
+
+# ---------------------------------------------------------------------------
+# Terraform remote state backend (OCI Object Storage, S3-compatible)
+# ---------------------------------------------------------------------------
+
+def create_s3_backend_bucket(namespace: str, bucket: str) -> bool:
+    """Create the state bucket if it does not already exist."""
+    import oci
+
+    if oci_try("object_storage", "get_bucket", namespace_name=namespace,
+               bucket_name=bucket) is not None:
+        print_status(f"Backend bucket '{bucket}' already exists")
+        return True
+    print_status(f"Creating backend bucket '{bucket}'...")
+    details = oci.object_storage.models.CreateBucketDetails(
+        name=bucket,
+        compartment_id=oci_config.tenancy_ocid,
+        versioning="Enabled")
+    result = oci_try("object_storage", "create_bucket",
+                     namespace_name=namespace, create_bucket_details=details)
+    if result is None:
+        print_error(f"Failed to create backend bucket '{bucket}'")
+        return False
+    print_success(f"Created backend bucket '{bucket}'")
+    return True
+
+
+_BACKEND_TPL = '''terraform {{
+  backend "s3" {{
+    bucket = "{bucket}"
+    key    = "{state_key}"
+    region = "{region}"
+
+    endpoints = {{
+      s3 = "{endpoint}"
+    }}
+
+    skip_region_validation      = true
+    skip_credentials_validation = true
+    skip_requesting_account_id  = true
+    skip_metadata_api_check     = true
+    use_path_style              = true
+  }}
+}}
+'''
+
+
+def render_backend_tf(namespace: str, bucket: str, region: str,
+                      state_key: str, endpoint: str) -> None:
+    """Write backend.tf pointing Terraform state at OCI Object Storage.
+
+    Uses the S3-compatible backend with the modern ``endpoints`` block.
+    backend.tf may embed credentials; it is generated locally and must
+    never be committed (CI enforces this).
+    """
+    backend_content = _BACKEND_TPL.format_map({
+        "bucket": bucket,
+        "state_key": state_key,
+        "region": region,
+        "endpoint": endpoint,
+    })
+    Path("backend.tf").write_bytes(backend_content.encode("utf-8"))
+    print_success("Wrote backend.tf (OCI Object Storage via S3 compatibility)")
+
+
+def configure_terraform_backend() -> bool:
+    """Set up remote state in OCI Object Storage when TF_BACKEND=oci."""
+    settings = get_settings()
+    if settings.tf_backend.lower() != "oci":
+        print_debug("TF_BACKEND not set to 'oci'; using local state")
+        return True
+
+    print_header("Terraform Backend Configuration")
+    namespace = oci_try("object_storage", "get_namespace")
+    if not namespace:
+        print_error("Could not determine Object Storage namespace")
+        return False
+
+    bucket = settings.tf_backend_bucket
+    region = settings.tf_backend_region or oci_config.region
+    state_key = settings.tf_backend_state_key
+    endpoint = (settings.tf_backend_endpoint
+                or f"https://{namespace}.compat.objectstorage."
+                   f"{region}.oraclecloud.com")
+
+    if settings.tf_backend_create_bucket:
+        if not create_s3_backend_bucket(namespace, bucket):
+            return False
+
+    render_backend_tf(namespace, bucket, region, state_key, endpoint)
+    # A backend change requires init to re-read its configuration.
+    result = run_command(["terraform", "init", "-reconfigure", "-input=false"])
+    if result.returncode != 0:
+        print_error("terraform init -reconfigure failed:")
+        console.print(result.stderr or result.stdout)
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Prerequisites
+# ---------------------------------------------------------------------------
+
+def _apt_updated_recently(max_age_s: int = 3600) -> bool:
+    """True when the apt package lists were refreshed within *max_age_s*."""
+    try:
+        newest = max(p.stat().st_mtime
+                     for p in Path("/var/lib/apt/lists").glob("*"))
+    except (OSError, ValueError):
+        return False
+    return time.time() - newest < max_age_s
+
+
+def install_prerequisites() -> bool:
+    print_header("Installing Prerequisites")
+    required = ["unzip", "git", "jq", "python3"]
+    on_path = _path_exe_set()
+    missing = [tool for tool in required if tool not in on_path]
+
+    if command_exists("apt-get"):
+        if missing and not _apt_updated_recently():
+            print_status("Updating package lists...")
+            run_command(["sudo", "apt-get", "update", "-qq"])
+        if missing:
+            print_status(f"Installing: {', '.join(missing)}")
+            result = run_command(["sudo", "apt-get", "install", "-y", "-qq"] + missing)
+            if result.returncode != 0:
+                print_error("Failed to install prerequisites")
+                return False
+    elif missing:
+        print_error(f"Missing tools and no apt-get available: {', '.join(missing)}")
+        return False
+
+    if not install_oci_cli():
+        return False
+    if not install_terraform():
+        return False
+    print_success("All prerequisites installed")
+    return True
+
+
+def _oci_cli_venv_dir() -> Path:
+    """Shared CLI virtualenv, keyed by interpreter version and architecture.
+
+    Living under the user cache (not the working directory) lets repeat
+    runs from different checkouts reuse one install.
+    """
+    cache_root = Path(os.getenv("XDG_CACHE_HOME",
+                                str(Path.home() / ".cache")))
+    return (cache_root / "oci-terraform-setup"
+            / f"venv-py{sys.version_info.major}.{sys.version_info.minor}"
+              f"-{platform.machine()}")
+
+
+def install_oci_cli() -> bool:
+    """Ensure the OCI CLI is available (needed for session authentication)."""
+    if command_exists("oci"):
+        print_debug("OCI CLI already installed")
+        return True
+
+    venv_dir = _oci_cli_venv_dir()
+    oci_bin = venv_dir / "bin" / "oci"
+    if oci_bin.exists():
+        result = run_command([str(oci_bin), "--version"])
+        if result.returncode == 0:
+            print_debug(f"Reusing cached OCI CLI venv at {venv_dir}")
+            os.environ["PATH"] = (f"{venv_dir / 'bin'}{os.pathsep}"
+                                  f"{os.environ.get('PATH', '')}")
+            return True
+
+    print_status(f"Installing OCI CLI into {venv_dir}...")
+    venv_dir.parent.mkdir(parents=True, exist_ok=True)
+    if not (venv_dir / "bin" / "pip").exists():
+        result = run_command([sys.executable, "-m", "venv", str(venv_dir)])
+        if result.returncode != 0:
+            print_error("Failed to create virtualenv for the OCI CLI")
+            return False
+    result = run_command([str(venv_dir / "bin" / "pip"), "install", "-q",
+                          "--upgrade-strategy", "only-if-needed", "oci-cli"])
+    if result.returncode != 0:
+        print_error("Failed to install the OCI CLI")
+        return False
+    os.environ["PATH"] = f"{venv_dir / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}"
+    print_success("OCI CLI installed")
+    return True
+
+
+MIN_TF_VERSION = "1.5.0"
+DEFAULT_TF_VERSION = "1.9.5"
+
+
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:3])
+
+
+def _terraform_ready() -> bool:
+    """Fast path: True when an installed Terraform meets MIN_TF_VERSION."""
+    if not command_exists("terraform"):
+        return False
+    result = run_command(["terraform", "version", "-json"])
+    if result.returncode != 0:
+        return False
+    try:
+        installed = json.loads(result.stdout).get("terraform_version", "")
+    except ValueError:
+        return False
+    return bool(installed) and (_version_tuple(installed)
+                                >= _version_tuple(MIN_TF_VERSION))
+
+
+def install_terraform() -> bool:
+    """Ensure a usable Terraform, touching the network only when needed."""
+    if _terraform_ready():
+        print_success("Terraform is already installed")
+        return True
+    return _install_terraform_fresh()
+
+
+def _install_terraform_fresh() -> bool:
+    import hashlib
+    import tempfile
+    import urllib.request
+    import zipfile
+
+    version = get_settings().tf_version
+    if version is None:
+        try:
+            with urllib.request.urlopen(
+                    "https://api.github.com/repos/hashicorp/terraform/releases/latest",
+                    timeout=30) as response:
+                version = json.loads(response.read())["tag_name"].lstrip("v")
+        except (OSError, ValueError, KeyError):
+            print_warning(f"Could not determine latest Terraform release; "
+                          f"using pinned {DEFAULT_TF_VERSION}")
+            version = DEFAULT_TF_VERSION
+    print_status(f"Installing Terraform {version}")
+
+    zip_name = f"terraform_{version}_linux_amd64.zip"
+    url = f"https://releases.hashicorp.com/terraform/{version}/{zip_name}"
+    expected_sha256 = ""
+    try:
+        sums_url = (f"https://releases.hashicorp.com/terraform/{version}/"
+                    f"terraform_{version}_SHA256SUMS")
+        with urllib.request.urlopen(sums_url, timeout=30) as response:
+            for line in response.read().decode().splitlines():
+                digest, _, filename = line.strip().partition("  ")
+                if filename == zip_name:
+                    expected_sha256 = digest
+                    break
+    except OSError:
+        print_warning("Could not fetch SHA256SUMS; skipping checksum check")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        zip_path = Path(tmp) / "terraform.zip"
+        # Stream the ~25MB archive in 1MB chunks, hashing as we go,
+        # rather than materializing it in memory.
+        sha256 = hashlib.sha256()
+        with urllib.request.urlopen(url, timeout=120) as response, \
+                open(zip_path, "wb") as f:
+            while True:
+                chunk = response.read(1 << 20)
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                f.write(chunk)
+        if expected_sha256 and sha256.hexdigest() != expected_sha256:
+            print_error("Terraform download failed SHA256 verification")
+            return False
+        with zipfile.ZipFile(zip_path) as zf:
+            zf.extract("terraform", tmp)
+        binary = Path(tmp) / "terraform"
+        binary.chmod(0o755)
+        result = run_command(["sudo", "mv", str(binary), "/usr/local/bin/terraform"])
+        if result.returncode != 0:
+            print_error("Failed to move terraform into /usr/local/bin")
+            return False
+    print_success(f"Terraform {version} installed")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# OCI authentication
+# ---------------------------------------------------------------------------
+
+def detect_auth_method(exists: Optional[bool] = None) -> str:
+    """Determine how the current OCI config authenticates.
+
+    ``exists`` lets callers that already stat'ed the config file skip the
+    redundant parse when they know it is absent.
+    """
+    if exists is False:
+        return "instance_principal" if is_instance_principal_available() else ""
+    settings = get_settings()
+    parser = _load_oci_config(os.path.expanduser(settings.oci_config_file))
+    if parser is not None and parser.has_section(settings.oci_profile):
+        section = parser[settings.oci_profile]
+        # An explicit auth= entry settles it without touching other keys.
+        auth = section.get("auth", "")
+        if auth:
+            return auth
+        token_file = section.get("security_token_file", "")
+        if token_file and Path(os.path.expanduser(token_file)).exists():
+            return "security_token"
+        if section.get("key_file", "") and section.get("fingerprint", ""):
+            return "api_key"
+    if is_instance_principal_available():
+        return "instance_principal"
+    return ""
+
+
+def validate_existing_oci_config() -> bool:
+    """Sanity-check the config file, then verify API connectivity."""
+    config_path = Path(os.path.expanduser(get_settings().oci_config_file))
+    if not config_path.exists():
+        return False
+    tenancy = read_oci_config_value("tenancy")
+    region = read_oci_config_value("region")
+    if not tenancy or not region:
+        print_debug("Config file missing tenancy or region")
+        return False
+    method = detect_auth_method()
+    if not method:
+        print_debug("No usable auth method in config file")
+        return False
+    key_file = read_oci_config_value("key_file")
+    if key_file and not Path(os.path.expanduser(key_file)).exists():
+        print_debug(f"key_file missing: {key_file}")
+        return False
+    return test_oci_connectivity()
+
+
+# URL printed by `oci session authenticate --no-browser` on WSL.
+_WSL_URL_RE = re.compile(r"https://\S+")
+
+
+def _run_session_authenticate(profile: str, region: str) -> bool:
+    """Run ``oci session authenticate`` and record the new session.
+
+    On WSL the CLI cannot open a browser itself, so output is captured
+    and the login URL is surfaced (and opened on the Windows side where
+    possible).  Returns True once the session is established.
+    """
+    _flush_log()  # interactive from here on - no buffered output
+    cmd = ["oci", "session", "authenticate",
+           "--profile-name", profile, "--region", region]
+    if not is_wsl():
+        # The CLI opens the browser itself; run it interactively.
+        try:
+            returncode = run_command(cmd, capture_output=False,
+                                     timeout=600).returncode
+        except subprocess.TimeoutExpired:
+            print_error("Session authentication timed out")
+            return False
+    else:
+        # --no-browser prints the login URL; stream stdout so the URL is
+        # opened the moment it appears instead of after the CLI exits.
+        cmd.append("--no-browser")
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True)
+
+        def _watch_for_url() -> None:
+            opened = False
+            for line in proc.stdout:
+                match = _WSL_URL_RE.search(line)
+                if match and not opened:
+                    opened = True
+                    print_status(f"Open this URL in your browser to "
+                                 f"authenticate:\n  {match.group(0)}")
+                    open_url_best_effort(match.group(0))
+
+        watcher = threading.Thread(target=_watch_for_url, daemon=True)
+        watcher.start()
+        try:
+            returncode = proc.wait(timeout=600)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            print_error("Session authentication timed out")
+            return False
+        watcher.join(timeout=5)
+    if returncode != 0:
+        print_error("Session authentication failed")
+        return False
+    oci_config.auth_method = "security_token"
+    reset_oci_clients()
+    return True
+
+
+def setup_oci_config() -> bool:
+    """Create or repair the OCI config, using browser session authentication."""
+    _begin_batched_log()
+    print_header("OCI Configuration Setup")
+    settings = get_settings()
+    config_path = Path(os.path.expanduser(settings.oci_config_file))
+    auth_region = settings.oci_auth_region or default_region_for_host()
+    try:
+        cf_stat = config_path.stat()  # single stat, reused below
+    except OSError:
+        cf_stat = None
+
+    if settings.force_reauth:
+        print_status("FORCE_REAUTH=true - re-authenticating...")
+        return _run_session_authenticate(settings.oci_profile, auth_region)
+
+    if cf_stat is not None:
+        if validate_existing_oci_config():
+            print_success("Existing OCI configuration is valid")
+            oci_config.auth_method = detect_auth_method(exists=True)
+            _flush_log()
+            return True
+        print_warning("Existing OCI configuration is invalid - repairing...")
+        backup = config_path.with_suffix(f".bak.{time.strftime('%Y%m%d_%H%M%S')}")
+        shutil.move(str(config_path), str(backup))
+        cf_stat = None
+        print_status(f"Old config saved to {backup}")
+        return _run_session_authenticate(settings.oci_profile, auth_region)
+
+    print_status("No OCI configuration found - starting session authentication")
+    return _run_session_authenticate(settings.oci_profile, auth_region)
+
+
+_conn_ok_cache: Dict[Tuple[str, str, str], float] = {}
+_CONN_OK_TTL = 30.0  # seconds a successful probe stays trusted
+
+
+def test_oci_connectivity() -> bool:
+    """Verify we can reach the OCI API with the current credentials.
+
+    A successful probe is cached for a short TTL so the repeated checks
+    within a single setup_oci_config() run do not each pay for a round
+    trip; reset_oci_clients() drops the cache on re-authentication.
+    """
+    settings = get_settings()
+    key = (settings.oci_profile, settings.oci_config_file,
+           oci_config.auth_method)
+    if time.monotonic() - _conn_ok_cache.get(key, float("-inf")) < _CONN_OK_TTL:
+        print_debug("OCI connectivity recently verified - skipping probe")
+        return True
+    print_status("Testing OCI API connectivity...")
+    if oci_try("identity", "list_regions") is not None:
+        print_success("OCI API connectivity verified")
+        _conn_ok_cache[key] = time.monotonic()
+        return True
+    tenancy = read_oci_config_value("tenancy")
+    if tenancy:
+        if oci_try("identity", "get_tenancy", tenancy_id=tenancy) is not None:
+            print_success("OCI API connectivity verified (tenancy lookup)")
+            _conn_ok_cache[key] = time.monotonic()
+            return True
+    print_error("Cannot reach the OCI API with the current configuration")
+    return False
+
+
+# ---------------------------------------------------------------------------
+# OCI account details
+# ---------------------------------------------------------------------------
+
+def fetch_oci_config_values() -> bool:
+    """Populate oci_config from the config file (and API where necessary)."""
+    print_status("Reading OCI configuration values...")
+    values = read_oci_config_values(("tenancy", "user", "region", "fingerprint"))
+    oci_config.tenancy_ocid = values["tenancy"]
+    oci_config.user_ocid = values["user"]
+    oci_config.region = values["region"]
+    oci_config.fingerprint = values["fingerprint"]
+
+    if not oci_config.tenancy_ocid or not oci_config.region:
+        print_error("Config file is missing tenancy or region")
+        return False
+
+    if not oci_config.user_ocid:
+        if oci_config.auth_method == "security_token":
+            # Session tokens carry no user OCID and the lookup would be
+            # discarded anyway - skip the round trip.
+            print_debug("No user OCID available (session auth)")
+        else:
+            users = oci_try("identity", "list_users",
+                            compartment_id=oci_config.tenancy_ocid, limit=25)
+            if users:
+                oci_config.user_ocid = users[0]["id"]
+            else:
+                print_debug("No user OCID found via API")
+
+    print_success(f"Using tenancy {oci_config.tenancy_ocid[:40]}... "
+                  f"in {oci_config.region}")
+    return True
+
+
+def fetch_availability_domains() -> bool:
+    print_status("Fetching availability domains...")
+    domains = oci_try("identity", "list_availability_domains",
+                      compartment_id=oci_config.tenancy_ocid)
+    if domains is None:
+        print_error("Failed to list availability domains")
+        return False
+    if not domains:
+        print_error("No availability domains found")
+        return False
+    oci_config.availability_domain = domains[0]["name"]
+    print_success(f"Using availability domain: {oci_config.availability_domain}")
+    return True
+
+
+def _fetch_image(shape: str) -> Optional[Tuple[str, str]]:
+    """Return (ocid, display_name) of the newest available Ubuntu image.
+
+    The query is fully narrowed server-side (lifecycle filter, newest
+    first, limit 1) so only the single row we keep crosses the wire.
+    """
+    images = oci_try("compute", "list_images",
+                     compartment_id=oci_config.tenancy_ocid,
+                     operating_system="Canonical Ubuntu",
+                     shape=shape,
+                     lifecycle_state="AVAILABLE",
+                     sort_by="TIMECREATED", sort_order="DESC",
+                     limit=1)
+    if images is None:
+        return None
+    for image in images:
+        return image["id"], image.get("display_name", "")
+    return "", ""
+
+
+def fetch_ubuntu_images() -> bool:
+    """Find the newest Ubuntu images for the AMD and ARM free tier shapes.
+
+    The two lookups are independent, so they run concurrently.
+    """
+    print_status("Fetching latest Ubuntu images...")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        f_amd = pool.submit(_fetch_image, AMD_SHAPE)
+        f_arm = pool.submit(_fetch_image, ARM_SHAPE)
+        amd, arm = f_amd.result(), f_arm.result()
+
+    if amd is None:
+        print_error("Failed to list AMD images")
+        return False
+    if not amd[0]:
+        print_error("No suitable AMD Ubuntu image found")
+        return False
+    oci_config.ubuntu_image_ocid = amd[0]
+    print_success(f"AMD image: {amd[1]}")
+
+    if arm is None:
+        print_error("Failed to list ARM images")
+        return False
+    if not arm[0]:
+        print_error("No suitable ARM Ubuntu image found")
+        return False
+    oci_config.ubuntu_arm_image_ocid = arm[0]
+    print_success(f"ARM image: {arm[1]}")
+    return True
+
+
+def generate_ssh_keys() -> bool:
+    """Generate the SSH keypair used for instance access."""
+    print_status("Checking SSH keys...")
+    ssh_dir = Path.cwd() / "ssh_keys"
+    ssh_dir.mkdir(mode=0o700, exist_ok=True)
+    private_key = ssh_dir / "id_ed25519"
+    public_key = ssh_dir / "id_ed25519.pub"
+    legacy_key = ssh_dir / "id_rsa"
+    if not private_key.exists() and legacy_key.exists():
+        # Keep using an RSA keypair generated by an earlier run.
+        private_key, public_key = legacy_key, ssh_dir / "id_rsa.pub"
+
+    if not private_key.exists():
+        print_status("Generating a new SSH keypair (ed25519)...")
+        try:
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.primitives.asymmetric import ed25519
+        except ImportError:
+            # No cryptography available - fall back to the ssh-keygen binary.
+            result = run_command([
+                "ssh-keygen", "-t", "ed25519",
+                "-f", str(private_key), "-N", "", "-C", "oci-free-tier",
+            ])
+            if result.returncode != 0:
+                print_error("ssh-keygen failed")
+                return False
+        else:
+            priv = ed25519.Ed25519PrivateKey.generate()
+            private_key.write_bytes(priv.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.OpenSSH,
+                serialization.NoEncryption()))
+            private_key.chmod(0o600)
+            pub_bytes = priv.public_key().public_bytes(
+                serialization.Encoding.OpenSSH,
+                serialization.PublicFormat.OpenSSH)
+            public_key.write_bytes(pub_bytes + b" oci-free-tier\n")
+            # The bytes were just produced - no need to read them back.
+            oci_config.ssh_public_key = (pub_bytes + b" oci-free-tier").decode()
+        print_success(f"SSH keypair written to {ssh_dir}")
+    else:
+        print_debug("SSH keypair already exists")
+
+    if not oci_config.ssh_public_key:
+        oci_config.ssh_public_key = public_key.read_text().strip()
+    oci_config.ssh_key_name = private_key.name
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Resource inventory
+# ---------------------------------------------------------------------------
+
+# Cap concurrency to stay well inside OCI API rate limits.
+_DISCOVERY_MAX_WORKERS = 16
+_inventory_lock = threading.Lock()
+
+# Lifecycle states worth inventorying, frozen so membership checks are
+# a single hash lookup shared by every list filter.
+_ACTIVE_INSTANCE_STATES = frozenset(
+    {"RUNNING", "STOPPED", "PROVISIONING", "STARTING"})
+
+# Bumped on every inventory mutation; keys the memoized totals below.
+_inventory_generation = 0
+
+
+class _InventoryTotals(NamedTuple):
+    arm_ocpus: int
+    arm_memory_gb: int
+    boot_gb: int
+    block_gb: int
+
+
+_totals_cache: Optional[Tuple[int, _InventoryTotals]] = None
+
+
+def _bump_inventory_generation() -> None:
+    global _inventory_generation
+    _inventory_generation += 1
+
+
+def _inventory_totals() -> _InventoryTotals:
+    """Aggregate usage over the existing_* dicts in one pass.
+
+    Memoized against the inventory generation so the repeated
+    validation/display passes do not re-walk the same dicts.
+    """
+    global _totals_cache
+    if _totals_cache is not None and _totals_cache[0] == _inventory_generation:
+        return _totals_cache[1]
+    arm_ocpus = 0
+    arm_memory = 0
+    for resource in existing_arm_instances.values():
+        arm_ocpus += resource.ocpus
+        arm_memory += resource.memory_gb
+    boot_gb = sum(r.size_gb for r in existing_boot_volumes.values())
+    block_gb = sum(r.size_gb for r in existing_block_volumes.values())
+    totals = _InventoryTotals(arm_ocpus, arm_memory, boot_gb, block_gb)
+    _totals_cache = (_inventory_generation, totals)
+    return totals
+
+
+def _inventory_categories() -> Dict[str, Dict[str, ExistingResource]]:
+    """Name -> dict mapping for every inventoried resource category."""
+    return {
+        "vcns": existing_vcns,
+        "subnets": existing_subnets,
+        "internet_gateways": existing_internet_gateways,
+        "route_tables": existing_route_tables,
+        "security_lists": existing_security_lists,
+        "amd_instances": existing_amd_instances,
+        "arm_instances": existing_arm_instances,
+        "boot_volumes": existing_boot_volumes,
+        "block_volumes": existing_block_volumes,
+    }
+
+
+def _inventory_cache_path(tenancy_ocid: str) -> Path:
+    # The list calls are region-scoped, so the region belongs in the key:
+    # a tenancy-only cache would serve one region's OCIDs to another.
+    base = Path(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")))
+    return (base / "cloudcradle" /
+            f"inventory-{tenancy_ocid}_{oci_config.region}.json")
+
+
+def _load_inventory_cache(tenancy_ocid: str) -> bool:
+    """Populate the existing_* dicts from a fresh on-disk snapshot.
+
+    OCI state rarely changes between back-to-back runs, so a snapshot
+    younger than CLOUDCRADLE_CACHE_TTL seconds (default 300, 0 disables)
+    stands in for a full tenancy scan.
+    """
+    ttl = get_settings().inventory_cache_ttl
+    if ttl <= 0:
+        return False
+    path = _inventory_cache_path(tenancy_ocid)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return False
+        payload = _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return False
+    _bump_inventory_generation()
+    for category, target in _inventory_categories().items():
+        for rid, entry in (payload.get(category) or {}).items():
+            target[rid] = ExistingResource(
+                rid, entry.get("name", ""), entry.get("state", ""),
+                entry.get("additional_info") or {})
+    print_success("Loaded resource inventory from cache "
+                  "(set CLOUDCRADLE_CACHE_TTL=0 to force a rescan)")
+    return True
+
+
+def _save_inventory_cache(tenancy_ocid: str) -> None:
+    if get_settings().inventory_cache_ttl <= 0:
+        return
+    payload = {
+        category: {
+            rid: {"name": resource.name, "state": resource.state,
+                  "additional_info": resource.additional_info}
+            for rid, resource in target.items()
+        }
+        for category, target in _inventory_categories().items()
+    }
+    path = _inventory_cache_path(tenancy_ocid)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload))
+    except OSError as exc:
+        print_debug(f"Could not write inventory cache: {exc}")
+
+
+# Set once an inventory pass has populated the dicts this run, so
+# re-entrant callers do not trigger a second full tenancy scan.
+_INVENTORY_DONE = False
+
+
+def inventory_all_resources(force_refresh: bool = False) -> bool:
+    global _INVENTORY_DONE
+    if _INVENTORY_DONE and not force_refresh:
+        print_debug("Inventory already loaded this run - skipping rescan")
+        return True
+    print_header("Inventorying Existing Resources")
+    for target in _inventory_categories().values():
+        target.clear()
+    _bump_inventory_generation()
+
+    if not force_refresh and _load_inventory_cache(oci_config.tenancy_ocid):
+        _INVENTORY_DONE = True
+        return True
+    ok = discover_all_existing(oci_config.tenancy_ocid)
+    if ok:
+        _INVENTORY_DONE = True
+        _save_inventory_cache(oci_config.tenancy_ocid)
+    return ok
+
+
+def search_all_resources(compartment_id: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Find every resource we inventory in one ResourceSearch round-trip.
+
+    Returns summaries bucketed by lowercase resource type, or ``None``
+    when the search service is unavailable or rate-limited (callers then
+    fall back to per-service list calls).
+    """
+    import oci
+
+    details = oci.resource_search.models.StructuredSearchDetails(
+        query=("query instance, vcn, subnet, internetgateway, routetable, "
+               "securitylist, bootvolume, volume resources "
+               f"where compartmentId = '{compartment_id}'"),
+        type="Structured")
+    try:
+        data = oci_call("search", "search_resources", search_details=details,
+                        limit=1000)
+    except Exception as exc:  # noqa: BLE001 - fall back to list calls
+        print_debug(f"Resource search unavailable: {exc}")
+        return None
+    buckets: Dict[str, List[Dict[str, Any]]] = {}
+    for item in data.get("items") or []:
+        buckets.setdefault(item.get("resource_type", "").lower(), []).append(item)
+    return buckets
+
+
+def discover_all_existing(compartment_id: str) -> bool:
+    """Run the independent discovery jobs concurrently.
+
+    A single ResourceSearch query first establishes which resource
+    categories exist at all; the detail list calls (which carry shapes,
+    sizes and IPs that search summaries lack) only run for non-empty
+    categories.  The remaining jobs have no ordering dependencies, so
+    fanning them out makes total time max() rather than sum() of the
+    per-category latencies.
+    """
+    jobs = [
+        inventory_compute_instances,
+        inventory_networking,
+        _inventory_boot_volumes,
+        _inventory_block_volumes,
+    ]
+    buckets = search_all_resources(compartment_id)
+    if buckets is not None:
+        jobs = []
+        if buckets.get("instance"):
+            jobs.append(inventory_compute_instances)
+        if any(buckets.get(kind) for kind in
+               ("vcn", "subnet", "internetgateway", "routetable",
+                "securitylist")):
+            jobs.append(inventory_networking)
+        if buckets.get("bootvolume"):
+            jobs.append(_inventory_boot_volumes)
+        if buckets.get("volume"):
+            jobs.append(_inventory_block_volumes)
+        if not jobs:
+            print_success("Tenancy has no existing free tier resources")
+            return True
+    ok = True
+    with ThreadPoolExecutor(max_workers=_DISCOVERY_MAX_WORKERS) as executor:
+        futures = [executor.submit(job, compartment_id) for job in jobs]
+        for future in as_completed(futures):
+            try:
+                ok = future.result() and ok
+            except Exception as exc:  # noqa: BLE001 - report and continue
+                print_warning(f"Discovery job failed: {exc}")
+                ok = False
+    return ok
+
+
+def inventory_compute_instances(compartment_id: str) -> bool:
+    print_status("Inventorying compute instances...")
+    instances = oci_try("compute", "list_instances", paginate=True,
+                        compartment_id=compartment_id)
+    if instances is None:
+        print_warning("Could not list compute instances")
+        return False
+    amd: Dict[str, ExistingResource] = {}
+    arm: Dict[str, ExistingResource] = {}
+    eligible = [i for i in instances
+                if i.get("lifecycle_state", "") in _ACTIVE_INSTANCE_STATES]
+
+    # One compartment-wide attachment listing replaces a list call per
+    # instance; only the VNIC detail gets remain per-instance.
+    inst_to_vnic: Dict[str, str] = {}
+    if eligible:
+        attachments = oci_try("compute", "list_vnic_attachments",
+                              paginate=True,
+                              compartment_id=compartment_id) or []
+        inst_to_vnic = {
+            att["instance_id"]: att["vnic_id"]
+            for att in attachments
+            if att.get("lifecycle_state") == "ATTACHED" and att.get("vnic_id")
+        }
+
+    def _instance_resource(instance: Dict[str, Any]) -> Tuple[str, ExistingResource]:
+        instance_id = instance["id"]
+        shape = instance.get("shape", "")
+        info: Dict[str, Any] = {"shape": shape}
+
+        if shape == ARM_SHAPE:
+            # list_instances already returns the flexible shape
+            # configuration - no per-instance get needed.
+            shape_config = instance.get("shape_config") or {}
+            info["ocpus"] = int(shape_config.get("ocpus", 0) or 0)
+            info["memory_gb"] = int(shape_config.get("memory_in_gbs", 0) or 0)
+
+        # Resolve the IPs through the primary VNIC.
+        vnic_id = inst_to_vnic.get(instance_id, "")
+        if vnic_id:
+            vnic = oci_try("network", "get_vnic", vnic_id=vnic_id) or {}
+            if vnic.get("public_ip"):
+                info["public_ip"] = vnic["public_ip"]
+            if vnic.get("private_ip"):
+                info["private_ip"] = vnic["private_ip"]
+
+        return shape, ExistingResource(
+            instance_id, instance.get("display_name", ""),
+            instance.get("lifecycle_state", ""), info)
+
+    if eligible:
+        # Per-instance detail lookups are independent - fan them out.
+        workers = min(_DISCOVERY_MAX_WORKERS, len(eligible))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for shape, resource in executor.map(_instance_resource, eligible):
+                if shape == AMD_SHAPE:
+                    amd[resource.id] = resource
+                elif shape == ARM_SHAPE:
+                    arm[resource.id] = resource
+
+    with _inventory_lock:
+        existing_amd_instances.update(amd)
+        existing_arm_instances.update(arm)
+        _bump_inventory_generation()
+    print_success(f"Found {len(amd)} AMD and {len(arm)} ARM instances")
+    return True
+
+
+def inventory_networking(compartment_id: str) -> bool:
+    print_status("Inventorying networking resources...")
+    vcn_data = oci_try("network", "list_vcns", paginate=True,
+                       compartment_id=compartment_id)
+    if vcn_data is None:
+        print_warning("Could not list VCNs")
+        return False
+    vcns: Dict[str, ExistingResource] = {}
+    subnets: Dict[str, ExistingResource] = {}
+    gateways: Dict[str, ExistingResource] = {}
+    route_tables: Dict[str, ExistingResource] = {}
+    security_lists: Dict[str, ExistingResource] = {}
+
+    for vcn in vcn_data:
+        if vcn.get("lifecycle_state") != "AVAILABLE":
+            continue
+        vcn_id = vcn["id"]
+        vcns[vcn_id] = ExistingResource(
+            vcn_id, vcn.get("display_name", ""), vcn["lifecycle_state"],
+            {"cidr_block": vcn.get("cidr_block", "")})
+
+    # Each sub-resource kind supports a compartment-wide listing, so one
+    # paginated call per kind replaces a call per (VCN, kind) pair; the
+    # per-VCN grouping happens client-side off the vcn_id field.  The
+    # four calls are independent and run concurrently.
+    kinds = (
+        ("list_subnets", subnets),
+        ("list_internet_gateways", gateways),
+        ("list_route_tables", route_tables),
+        ("list_security_lists", security_lists),
+    )
+    if vcns:
+        with ThreadPoolExecutor(max_workers=len(kinds)) as executor:
+            futures = {
+                executor.submit(oci_try, "network", method, paginate=True,
+                                compartment_id=compartment_id): target
+                for method, target in kinds
+            }
+            for future in as_completed(futures):
+                target = futures[future]
+                for item in future.result() or []:
+                    if item.get("lifecycle_state") != "AVAILABLE":
+                        continue
+                    vcn_id = item.get("vcn_id", "")
+                    if vcn_id not in vcns:
+                        continue
+                    info = {"vcn_id": vcn_id}
+                    if "cidr_block" in item:
+                        info["cidr_block"] = item.get("cidr_block", "")
+                    target[item["id"]] = ExistingResource(
+                        item["id"], item.get("display_name", ""),
+                        item["lifecycle_state"], info)
+
+    with _inventory_lock:
+        existing_vcns.update(vcns)
+        existing_subnets.update(subnets)
+        existing_internet_gateways.update(gateways)
+        existing_route_tables.update(route_tables)
+        existing_security_lists.update(security_lists)
+        _bump_inventory_generation()
+    print_success(f"Found {len(vcns)} VCNs, {len(subnets)} subnets")
+    return True
+
+
+def inventory_storage(compartment_id: str) -> bool:
+    ok = _inventory_boot_volumes(compartment_id)
+    return _inventory_block_volumes(compartment_id) and ok
+
+
+def _inventory_boot_volumes(compartment_id: str) -> bool:
+    print_status("Inventorying boot volumes...")
+    domains = oci_try("identity", "list_availability_domains",
+                      compartment_id=compartment_id)
+    if domains is None:
+        print_warning("Could not list availability domains for storage inventory")
+        return False
+    volumes: Dict[str, ExistingResource] = {}
+
+    for domain in domains:
+        _collect_volumes(volumes,
+                         oci_try("blockstorage", "list_boot_volumes",
+                                 paginate=True,
+                                 compartment_id=compartment_id,
+                                 availability_domain=domain["name"]))
+
+    with _inventory_lock:
+        existing_boot_volumes.update(volumes)
+        _bump_inventory_generation()
+    print_success(f"Found {len(volumes)} boot volumes")
+    return True
+
+
+def _collect_volumes(target: Dict[str, ExistingResource],
+                     rows: Optional[List[Dict[str, Any]]]) -> None:
+    """Fold AVAILABLE boot/block volume rows into *target*.
+
+    Boot and block volumes share the same response shape, so both
+    inventory paths funnel through this one collector.
+    """
+    for volume in rows or []:
+        if volume.get("lifecycle_state") != "AVAILABLE":
+            continue
+        target[volume["id"]] = ExistingResource(
+            volume["id"], volume.get("display_name", ""),
+            volume["lifecycle_state"],
+            {"size_gb": int(float(volume.get("size_in_gbs", 0) or 0))})
+
+
+def _inventory_block_volumes(compartment_id: str) -> bool:
+    print_status("Inventorying block volumes...")
+    volumes: Dict[str, ExistingResource] = {}
+    _collect_volumes(volumes,
+                     oci_try("blockstorage", "list_volumes", paginate=True,
+                             compartment_id=compartment_id))
+
+    with _inventory_lock:
+        existing_block_volumes.update(volumes)
+        _bump_inventory_generation()
+    print_success(f"Found {len(volumes)} block volumes")
+    return True
+
+
+def display_resource_inventory() -> None:
+    print_header("Existing Resource Inventory")
+
+    instances_table = Table(title="Compute Instances")
+    instances_table.add_column("Name")
+    instances_table.add_column("Shape")
+    instances_table.add_column("State")
+    instances_table.add_column("OCPUs")
+    instances_table.add_column("Memory")
+    instances_table.add_column("Public IP")
+    for resource in existing_amd_instances.values():
+        instances_table.add_row(resource.name, AMD_SHAPE, resource.state,
+                                "1", "1 GB",
+                                resource.additional_info.get("public_ip", "-"))
+    for resource in existing_arm_instances.values():
+        instances_table.add_row(
+            resource.name, ARM_SHAPE, resource.state,
+            str(resource.additional_info.get("ocpus", "?")),
+            f"{resource.additional_info.get('memory_gb', '?')} GB",
+            resource.additional_info.get("public_ip", "-"))
+
+    network_table = Table(title="Networking")
+    network_table.add_column("Type")
+    network_table.add_column("Name")
+    network_table.add_column("Details")
+    for resource in existing_vcns.values():
+        network_table.add_row("VCN", resource.name,
+                              resource.additional_info.get("cidr_block", ""))
+    for resource in existing_subnets.values():
+        network_table.add_row("Subnet", resource.name,
+                              resource.additional_info.get("cidr_block", ""))
+    for resource in existing_internet_gateways.values():
+        network_table.add_row("Internet Gateway", resource.name, "")
+
+    storage_table = Table(title="Storage")
+    storage_table.add_column("Type")
+    storage_table.add_column("Name")
+    storage_table.add_column("Size")
+    for resource in existing_boot_volumes.values():
+        storage_table.add_row("Boot Volume", resource.name,
+                              f"{resource.additional_info.get('size_gb', '?')} GB")
+    for resource in existing_block_volumes.values():
+        storage_table.add_row("Block Volume", resource.name,
+                              f"{resource.additional_info.get('size_gb', '?')} GB")
+
+    totals = _inventory_totals()
+    # One render/flush for the whole report instead of four.
+    console.print(Group(
+        instances_table, network_table, storage_table,
+        f"\nIn use: {len(existing_amd_instances)}/{MAX_AMD_INSTANCES} AMD instances, "
+        f"{totals.arm_ocpus}/{MAX_ARM_OCPUS} ARM OCPUs, "
+        f"{totals.arm_memory_gb}/{MAX_ARM_MEMORY_GB} GB ARM memory, "
+        f"{totals.boot_gb + totals.block_gb}/{MAX_STORAGE_GB} GB storage"))
+
+
+def calculate_available_resources() -> None:
+    """Work out how much free tier headroom remains."""
+    totals = _inventory_totals()
+    used_storage = totals.boot_gb + totals.block_gb
+
+    available_resources["amd_instances"] = max(
+        0, MAX_AMD_INSTANCES - len(existing_amd_instances))
+    available_resources["arm_ocpus"] = max(
+        0, MAX_ARM_OCPUS - totals.arm_ocpus)
+    available_resources["arm_memory_gb"] = max(
+        0, MAX_ARM_MEMORY_GB - totals.arm_memory_gb)
+    available_resources["storage_gb"] = max(0, MAX_STORAGE_GB - used_storage)
+    available_resources["vcns"] = max(0, MAX_VCNS - len(existing_vcns))
+
+    print_status(
+        f"Available: {available_resources['amd_instances']} AMD instances, "
+        f"{available_resources['arm_ocpus']} ARM OCPUs, "
+        f"{available_resources['arm_memory_gb']} GB ARM memory, "
+        f"{available_resources['storage_gb']} GB storage")
+
+
+def validate_proposed_config() -> bool:
+    """Check the chosen layout fits inside the Always Free limits."""
+    errors = []
+    if instance_config.amd_count > MAX_AMD_INSTANCES:
+        errors.append(f"AMD instance count {instance_config.amd_count} exceeds "
+                      f"the free tier limit of {MAX_AMD_INSTANCES}")
+    total_ocpus = sum(instance_config.arm_ocpus)
+    if total_ocpus > MAX_ARM_OCPUS:
+        errors.append(f"Total ARM OCPUs {total_ocpus} exceeds the free tier "
+                      f"limit of {MAX_ARM_OCPUS}")
+    total_memory = sum(instance_config.arm_memory_gbs)
+    if total_memory > MAX_ARM_MEMORY_GB:
+        errors.append(f"Total ARM memory {total_memory} GB exceeds the free "
+                      f"tier limit of {MAX_ARM_MEMORY_GB} GB")
+    total_storage = (sum(instance_config.boot_volume_sizes)
+                     + sum(instance_config.block_volume_sizes))
+    if total_storage > MAX_STORAGE_GB:
+        errors.append(f"Total storage {total_storage} GB exceeds the free "
+                      f"tier limit of {MAX_STORAGE_GB} GB")
+    for size in instance_config.boot_volume_sizes:
+        if size < MIN_BOOT_VOLUME_GB:
+            errors.append(f"Boot volume size {size} GB is below the minimum "
+                          f"of {MIN_BOOT_VOLUME_GB} GB")
+    for error in errors:
+        print_error(error)
+    return not errors
+
+
+# ---------------------------------------------------------------------------
+# Configuration selection
+# ---------------------------------------------------------------------------
+
+# One alternation covering every variables.tf field we recover; a single
+# finditer pass replaces a whole-file scan per field.
+_VARS_RE = re.compile(
+    r"(?P<key>amd_instance_count|arm_instance_count|amd_hostnames|"
+    r"arm_hostnames|arm_ocpus|arm_memory_gbs|boot_volume_sizes)"
+    r"\s*=\s*(?P<val>\d+|\[[^\]]*\])")
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_INT_RE = re.compile(r"\d+")
+
+
+def load_existing_config() -> bool:
+    """Recover the previous instance layout from variables.tf, if present."""
+    variables_file = Path("variables.tf")
+    if not variables_file.exists():
+        return False
+    content = variables_file.read_text()
+
+    found: Dict[str, str] = {}
+    for match in _VARS_RE.finditer(content):
+        found.setdefault(match.group("key"), match.group("val"))
+
+    if "amd_instance_count" not in found:
+        return False
+    instance_config.amd_count = int(found["amd_instance_count"])
+
+    if "amd_hostnames" in found:
+        instance_config.amd_hostnames = _QUOTED_RE.findall(
+            found["amd_hostnames"])
+    if "arm_instance_count" in found:
+        instance_config.arm_count = int(found["arm_instance_count"])
+    if "arm_hostnames" in found:
+        instance_config.arm_hostnames = _QUOTED_RE.findall(
+            found["arm_hostnames"])
+    if "arm_ocpus" in found:
+        instance_config.arm_ocpus = [int(v) for v in
+                                     _INT_RE.findall(found["arm_ocpus"])]
+    if "arm_memory_gbs" in found:
+        instance_config.arm_memory_gbs = [
+            int(v) for v in _INT_RE.findall(found["arm_memory_gbs"])]
+    if "boot_volume_sizes" in found:
+        instance_config.boot_volume_sizes = [
+            int(v) for v in _INT_RE.findall(found["boot_volume_sizes"])]
+
+    print_success("Loaded existing configuration from variables.tf")
+    return True
+
+
+def prompt_configuration() -> bool:
+    """Let the user pick how to lay out their free tier instances."""
+    print_header("Instance Configuration")
+
+    settings = get_settings()
+    if settings.auto_use_existing and (existing_amd_instances
+                                       or existing_arm_instances):
+        print_status("AUTO_USE_EXISTING=true - adopting existing instances")
+        return configure_from_existing_instances()
+    if settings.non_interactive:
+        print_status("Non-interactive mode - using maximum free tier layout")
+        return configure_maximum_free_tier()
+
+    console.print("How would you like to configure your instances?\n")
+    console.print("  1) Adopt existing instances as-is")
+    console.print("  2) Maximum free tier (fill all remaining capacity)")
+    console.print("  3) Custom configuration")
+    console.print("  4) Exit\n")
+    choice = IntPrompt.ask("Choose an option", default=2)
+
+    if choice == 1:
+        return configure_from_existing_instances()
+    elif choice == 2:
+        return configure_maximum_free_tier()
+    elif choice == 3:
+        return configure_custom_instances()
+    else:
+        print_status("Exiting at user request")
+        return False
+
+
+def configure_from_existing_instances() -> bool:
+    """Mirror the currently-deployed instances in the Terraform config."""
+    instance_config.amd_count = len(existing_amd_instances)
+    instance_config.amd_hostnames = [
+        resource.name for resource in existing_amd_instances.values()]
+
+    # One pass over the ARM dict fills all three parallel lists.
+    arm = list(existing_arm_instances.values())
+    instance_config.arm_count = len(arm)
+    instance_config.arm_hostnames = [resource.name for resource in arm]
+    instance_config.arm_ocpus = [resource.ocpus or 1 for resource in arm]
+    instance_config.arm_memory_gbs = [resource.memory_gb or 6
+                                      for resource in arm]
+
+    total = instance_config.amd_count + instance_config.arm_count
+    instance_config.boot_volume_sizes = [MIN_BOOT_VOLUME_GB] * total
+    instance_config.block_volume_sizes = []
+
+    if total == 0:
+        print_warning("No existing instances found to adopt")
+        return configure_maximum_free_tier()
+    print_success(f"Adopted {instance_config.amd_count} AMD and "
+                  f"{instance_config.arm_count} ARM instances")
+    return validate_proposed_config()
+
+
+def configure_maximum_free_tier() -> bool:
+    """Fill the remaining free tier capacity with a sensible default layout."""
+    amd_available = available_resources["amd_instances"]
+    arm_ocpus_available = available_resources["arm_ocpus"]
+    arm_memory_available = available_resources["arm_memory_gb"]
+
+    instance_config.amd_count = len(existing_amd_instances) + amd_available
+    instance_config.amd_hostnames = []
+    for resource in existing_amd_instances.values():
+        instance_config.amd_hostnames.append(resource.name)
+    index = 1
+    while len(instance_config.amd_hostnames) < instance_config.amd_count:
+        name = f"amd-instance-{index}"
+        if name not in instance_config.amd_hostnames:
+            instance_config.amd_hostnames.append(name)
+        index += 1
+
+    instance_config.arm_hostnames = []
+    instance_config.arm_ocpus = []
+    instance_config.arm_memory_gbs = []
+    for resource in existing_arm_instances.values():
+        instance_config.arm_hostnames.append(resource.name)
+        instance_config.arm_ocpus.append(resource.ocpus or 1)
+        instance_config.arm_memory_gbs.append(resource.memory_gb or 6)
+    if arm_ocpus_available > 0 and arm_memory_available > 0:
+        # One big ARM instance with everything that is left.
+        instance_config.arm_hostnames.append(
+            f"arm-instance-{len(instance_config.arm_hostnames) + 1}")
+        instance_config.arm_ocpus.append(arm_ocpus_available)
+        instance_config.arm_memory_gbs.append(arm_memory_available)
+    instance_config.arm_count = len(instance_config.arm_hostnames)
+
+    total = instance_config.amd_count + instance_config.arm_count
+    instance_config.boot_volume_sizes = [MIN_BOOT_VOLUME_GB] * total
+    instance_config.block_volume_sizes = []
+
+    print_success(f"Configured {instance_config.amd_count} AMD and "
+                  f"{instance_config.arm_count} ARM instances "
+                  f"(maximum free tier)")
+    return validate_proposed_config()
+
+
+def _ask_hostnames(label: str, count: int, prefix: str) -> List[str]:
+    """Collect *count* hostnames with a single comma-separated prompt.
+
+    One prompt replaces a Rich render cycle per hostname; missing or
+    blank entries fall back to the numbered defaults.
+    """
+    if count <= 0:
+        return []
+    defaults = [f"{prefix}-{i + 1}" for i in range(count)]
+    raw = ask_str(f"{label} hostnames (comma-separated)",
+                  ",".join(defaults))
+    names = [name.strip() for name in raw.split(",") if name.strip()][:count]
+    names.extend(defaults[len(names):])
+    return names
+
+
+def configure_custom_instances() -> bool:
+    """Interactively prompt for a custom instance layout."""
+    amd_max = MAX_AMD_INSTANCES
+    instance_config.amd_count = ask_int(
+        f"Number of AMD instances (0-{amd_max})", amd_max, 0, amd_max)
+    instance_config.amd_hostnames = _ask_hostnames(
+        "AMD", instance_config.amd_count, "amd-instance")
+
+    instance_config.arm_count = ask_int(
+        f"Number of ARM instances (0-{MAX_ARM_INSTANCES})", 1, 0,
+        MAX_ARM_INSTANCES)
+    instance_config.arm_hostnames = _ask_hostnames(
+        "ARM", instance_config.arm_count, "arm-instance")
+    instance_config.arm_ocpus = []
+    instance_config.arm_memory_gbs = []
+    for hostname in instance_config.arm_hostnames:
+        ocpus = ask_int(f"OCPUs for {hostname} (1-{MAX_ARM_OCPUS})",
+                        MAX_ARM_OCPUS // max(instance_config.arm_count, 1),
+                        1, MAX_ARM_OCPUS)
+        instance_config.arm_ocpus.append(ocpus)
+        memory = ask_int(f"Memory GB for {hostname} (6-{MAX_ARM_MEMORY_GB})",
+                         ocpus * 6, 6, MAX_ARM_MEMORY_GB)
+        instance_config.arm_memory_gbs.append(memory)
+
+    total = instance_config.amd_count + instance_config.arm_count
+    instance_config.boot_volume_sizes = []
+    for i in range(total):
+        size = ask_int(f"Boot volume GB for instance {i + 1} "
+                       f"(min {MIN_BOOT_VOLUME_GB})",
+                       MIN_BOOT_VOLUME_GB, MIN_BOOT_VOLUME_GB, MAX_STORAGE_GB)
+        instance_config.boot_volume_sizes.append(size)
+    instance_config.block_volume_sizes = []
+
+    return validate_proposed_config()
+
+
+# ---------------------------------------------------------------------------
+# Terraform file generation
+# ---------------------------------------------------------------------------
+#
+# Templates are module-level constants.  The two that interpolate values
+# use str.format_map placeholders; literal HCL braces in those are doubled.
+
+_PROVIDER_TPL = '''terraform {{
+  required_version = ">= 1.5"
+  required_providers {{
+    oci = {{
+      source  = "oracle/oci"
+      version = "~> 6.0"
+    }}
+  }}
+}}
+
+provider "oci" {{
+{auth_lines}  region              = local.region
+}}
+'''
+
+_VARIABLES_TPL = '''# Generated by oci_terraform_setup - re-run the setup to change values.
+locals {{
+  tenancy_ocid        = "{tenancy_ocid}"
+  user_ocid           = "{user_ocid}"
+  region              = "{region}"
+  availability_domain = "{availability_domain}"
+  ssh_public_key      = file("${{path.module}}/ssh_keys/{ssh_key_name}.pub")
+
+  ubuntu_image_ocid     = "{ubuntu_image_ocid}"
+  ubuntu_arm_image_ocid = "{ubuntu_arm_image_ocid}"
+
+  amd_instance_count = {amd_count}
+  amd_hostnames      = {amd_hostnames}
+  arm_instance_count = {arm_count}
+  arm_hostnames      = {arm_hostnames}
+  arm_ocpus          = {arm_ocpus}
+  arm_memory_gbs     = {arm_memory}
+  boot_volume_sizes  = {boot_sizes}
+  block_volume_sizes = {block_sizes}
+}}
+'''
+
+_VARIABLES_CHECKS = '''
+# Always Free tier guard rails - fail the plan rather than incur charges.
+check "free_tier_amd_instances" {
+  assert {
+    condition     = local.amd_instance_count <= 2
+    error_message = "Always Free tier allows at most 2 AMD micro instances."
+  }
+}
+
+check "free_tier_arm_ocpus" {
+  assert {
+    condition     = sum(concat(local.arm_ocpus, [0])) <= 4
+    error_message = "Always Free tier allows at most 4 ARM OCPUs in total."
+  }
+}
+
+check "free_tier_arm_memory" {
+  assert {
+    condition     = sum(concat(local.arm_memory_gbs, [0])) <= 24
+    error_message = "Always Free tier allows at most 24 GB of ARM memory."
+  }
+}
+
+check "free_tier_storage" {
+  assert {
+    condition     = sum(concat(local.boot_volume_sizes, local.block_volume_sizes, [0])) <= 200
+    error_message = "Always Free tier allows at most 200 GB of block storage."
+  }
+}
+'''
+
+
+_DATASOURCES_TF = '''data "oci_identity_availability_domains" "ads" {
+  compartment_id = local.tenancy_ocid
+}
+
+data "oci_core_vcns" "existing" {
+  compartment_id = local.tenancy_ocid
+}
+'''
+
+_MAIN_TF = '''# Always Free tier infrastructure: one VCN with public networking plus
+# the AMD and ARM instances configured in variables.tf.
+
+resource "oci_core_vcn" "free_tier_vcn" {
+  compartment_id = local.tenancy_ocid
+  display_name   = "free-tier-vcn"
+  cidr_blocks    = ["10.0.0.0/16"]
+  dns_label      = "freetier"
+  is_ipv6enabled = true
+}
+
+resource "oci_core_internet_gateway" "free_tier_igw" {
+  compartment_id = local.tenancy_ocid
+  vcn_id         = oci_core_vcn.free_tier_vcn.id
+  display_name   = "free-tier-igw"
+  enabled        = true
+}
+
+resource "oci_core_route_table" "free_tier_rt" {
+  compartment_id = local.tenancy_ocid
+  vcn_id         = oci_core_vcn.free_tier_vcn.id
+  display_name   = "free-tier-rt"
+
+  route_rules {
+    destination       = "0.0.0.0/0"
+    destination_type  = "CIDR_BLOCK"
+    network_entity_id = oci_core_internet_gateway.free_tier_igw.id
+  }
+
+  route_rules {
+    destination       = "::/0"
+    destination_type  = "CIDR_BLOCK"
+    network_entity_id = oci_core_internet_gateway.free_tier_igw.id
+  }
+}
+
+resource "oci_core_security_list" "free_tier_sl" {
+  compartment_id = local.tenancy_ocid
+  vcn_id         = oci_core_vcn.free_tier_vcn.id
+  display_name   = "free-tier-sl"
+
+  egress_security_rules {
+    destination = "0.0.0.0/0"
+    protocol    = "all"
+  }
+
+  ingress_security_rules {
+    protocol = "6"
+    source   = "0.0.0.0/0"
+    tcp_options {
+      min = 22
+      max = 22
+    }
+  }
+
+  ingress_security_rules {
+    protocol = "6"
+    source   = "0.0.0.0/0"
+    tcp_options {
+      min = 80
+      max = 80
+    }
+  }
+
+  ingress_security_rules {
+    protocol = "6"
+    source   = "0.0.0.0/0"
+    tcp_options {
+      min = 443
+      max = 443
+    }
+  }
+
+  ingress_security_rules {
+    protocol = "1"
+    source   = "0.0.0.0/0"
+  }
+}
+
+resource "oci_core_subnet" "free_tier_subnet" {
+  compartment_id    = local.tenancy_ocid
+  vcn_id            = oci_core_vcn.free_tier_vcn.id
+  display_name      = "free-tier-subnet"
+  cidr_block        = "10.0.1.0/24"
+  route_table_id    = oci_core_route_table.free_tier_rt.id
+  security_list_ids = [oci_core_security_list.free_tier_sl.id]
+  dns_label         = "public"
+}
+
+resource "oci_core_instance" "amd_instance" {
+  count               = local.amd_instance_count
+  compartment_id      = local.tenancy_ocid
+  availability_domain = local.availability_domain
+  display_name        = local.amd_hostnames[count.index]
+  shape               = "VM.Standard.E2.1.Micro"
+
+  source_details {
+    source_type             = "image"
+    source_id               = local.ubuntu_image_ocid
+    boot_volume_size_in_gbs = local.boot_volume_sizes[count.index]
+  }
+
+  create_vnic_details {
+    subnet_id        = oci_core_subnet.free_tier_subnet.id
+    assign_public_ip = true
+    hostname_label   = local.amd_hostnames[count.index]
+  }
+
+  metadata = {
+    ssh_authorized_keys = local.ssh_public_key
+    user_data           = base64encode(file("${path.module}/cloud-init.yaml"))
+  }
+
+  lifecycle {
+    ignore_changes = [source_details, metadata]
+  }
+}
+
+resource "oci_core_instance" "arm_instance" {
+  count               = local.arm_instance_count
+  compartment_id      = local.tenancy_ocid
+  availability_domain = local.availability_domain
+  display_name        = local.arm_hostnames[count.index]
+  shape               = "VM.Standard.A1.Flex"
+
+  shape_config {
+    ocpus         = local.arm_ocpus[count.index]
+    memory_in_gbs = local.arm_memory_gbs[count.index]
+  }
+
+  source_details {
+    source_type             = "image"
+    source_id               = local.ubuntu_arm_image_ocid
+    boot_volume_size_in_gbs = local.boot_volume_sizes[local.amd_instance_count + count.index]
+  }
+
+  create_vnic_details {
+    subnet_id        = oci_core_subnet.free_tier_subnet.id
+    assign_public_ip = true
+    hostname_label   = local.arm_hostnames[count.index]
+  }
+
+  metadata = {
+    ssh_authorized_keys = local.ssh_public_key
+    user_data           = base64encode(file("${path.module}/cloud-init.yaml"))
+  }
+
+  lifecycle {
+    ignore_changes = [source_details, metadata]
+  }
+}
+
+output "amd_instance_public_ips" {
+  value = [for instance in oci_core_instance.amd_instance : instance.public_ip]
+}
+
+output "arm_instance_public_ips" {
+  value = [for instance in oci_core_instance.arm_instance : instance.public_ip]
+}
+'''
+
+_BLOCK_VOLUMES_TF = '''resource "oci_core_volume" "block_volume" {
+  count               = length(local.block_volume_sizes)
+  compartment_id      = local.tenancy_ocid
+  availability_domain = local.availability_domain
+  display_name        = "block-volume-${count.index + 1}"
+  size_in_gbs         = local.block_volume_sizes[count.index]
+}
+
+resource "oci_core_volume_attachment" "block_volume_attachment" {
+  count           = length(local.block_volume_sizes)
+  attachment_type = "paravirtualized"
+  instance_id     = oci_core_instance.arm_instance[0].id
+  volume_id       = oci_core_volume.block_volume[count.index].id
+}
+'''
+
+_CLOUD_INIT_YAML = '''#cloud-config
+package_update: true
+package_upgrade: true
+
+packages:
+  - curl
+  - git
+  - htop
+  - fail2ban
+  - unattended-upgrades
+
+runcmd:
+  - systemctl enable fail2ban
+  - systemctl start fail2ban
+  - systemctl enable unattended-upgrades
+  # OCI Ubuntu images ship restrictive iptables rules; open web ports.
+  - iptables -I INPUT 6 -m state --state NEW -p tcp --dport 80 -j ACCEPT
+  - iptables -I INPUT 6 -m state --state NEW -p tcp --dport 443 -j ACCEPT
+  - netfilter-persistent save || true
+
+final_message: "Free tier instance ready after $UPTIME seconds"
+'''
+
+
+def _write_generated_file(path: Path, content: str, ts: str) -> None:
+    """Back up *path* if present, then write *content*."""
+    try:
+        # Rename moves the inode link; no data copy, no exists() probe.
+        os.replace(path, f"{path}.bak.{ts}")
+    except FileNotFoundError:
+        pass
+    # Bypass the text-mode codec/newline layer; one write of the payload.
+    path.write_bytes(content.encode("utf-8"))
+    print_status(f"Wrote {path}")
+
+
+def create_terraform_files() -> bool:
+    print_header("Generating Terraform Configuration")
+    ts = time.strftime("%Y%m%d_%H%M%S")
+    files = [
+        create_terraform_provider(),
+        create_terraform_variables(),
+        create_terraform_datasources(),
+        create_terraform_main(),
+        create_terraform_block_volumes(),
+        create_cloud_init(),
+    ]
+    # Content is all built in memory above; flush backups and writes in
+    # parallel, then settle dirty pages once instead of per file.
+    with ThreadPoolExecutor(max_workers=len(files)) as executor:
+        for future in [executor.submit(_write_generated_file, p, c, ts)
+                       for p, c in files]:
+            future.result()
+    if hasattr(os, "sync"):
+        os.sync()
+    print_success("Terraform configuration written")
+    return True
+
+
+def create_terraform_provider() -> Tuple[Path, str]:
+    if oci_config.auth_method == "security_token":
+        auth_lines = (f'  auth                = "SecurityToken"\n'
+                      f'  config_file_profile = "{get_settings().oci_profile}"\n')
+    else:
+        auth_lines = f'  config_file_profile = "{get_settings().oci_profile}"\n'
+
+    return Path("provider.tf"), _PROVIDER_TPL.format_map({"auth_lines": auth_lines})
+
+
+def create_terraform_variables() -> Tuple[Path, str]:
+    # JSON array syntax is valid HCL for string/number lists, and
+    # json.dumps beats building the literals element by element.
+    header = _VARIABLES_TPL.format_map({
+        "tenancy_ocid": oci_config.tenancy_ocid,
+        "user_ocid": oci_config.user_ocid,
+        "region": oci_config.region,
+        "availability_domain": oci_config.availability_domain,
+        "ssh_key_name": oci_config.ssh_key_name,
+        "ubuntu_image_ocid": oci_config.ubuntu_image_ocid,
+        "ubuntu_arm_image_ocid": oci_config.ubuntu_arm_image_ocid,
+        "amd_count": instance_config.amd_count,
+        "amd_hostnames": json.dumps(instance_config.amd_hostnames),
+        "arm_count": instance_config.arm_count,
+        "arm_hostnames": json.dumps(instance_config.arm_hostnames),
+        "arm_ocpus": json.dumps(instance_config.arm_ocpus),
+        "arm_memory": json.dumps(instance_config.arm_memory_gbs),
+        "boot_sizes": json.dumps(instance_config.boot_volume_sizes),
+        "block_sizes": json.dumps(instance_config.block_volume_sizes),
+    })
+    return Path("variables.tf"), header + _VARIABLES_CHECKS
+
+
+def create_terraform_datasources() -> Tuple[Path, str]:
+    return Path("datasources.tf"), _DATASOURCES_TF
+
+
+def create_terraform_main() -> Tuple[Path, str]:
+    return Path("main.tf"), _MAIN_TF
+
+
+def create_terraform_block_volumes() -> Tuple[Path, str]:
+    return Path("block_volumes.tf"), _BLOCK_VOLUMES_TF
+
+
+def create_cloud_init() -> Tuple[Path, str]:
+    return Path("cloud-init.yaml"), _CLOUD_INIT_YAML
+
+
+# ---------------------------------------------------------------------------
+# Importing existing resources into Terraform state
+# ---------------------------------------------------------------------------
+
+def import_existing_resources() -> bool:
+    """Import already-deployed resources so Terraform does not recreate them."""
+    print_header("Importing Existing Resources")
+
+    # Re-runs hit an already-initialized directory; skip the provider
+    # download and lockfile churn when both markers are present.
+    if Path(".terraform").is_dir() and Path(".terraform.lock.hcl").exists():
+        print_status("Terraform already initialized")
+    else:
+        result = retry_with_backoff(["terraform", "init", "-upgrade"])
+        if result.returncode != 0:
+            print_error("terraform init failed")
+            return False
+
+    # One `state list` replaces a `state show` subprocess per candidate.
+    in_state = frozenset(
+        line.strip()
+        for line in run_command(["terraform", "state", "list"]).stdout.splitlines()
+        if line.strip())
+
+    targets: List[Tuple[str, str]] = []
+    if existing_vcns:
+        vcn_id = next(iter(existing_vcns))
+        targets.append(("oci_core_vcn.free_tier_vcn", vcn_id))
+        targets.extend(_vcn_component_targets(vcn_id))
+    for index, resource in enumerate(existing_amd_instances.values()):
+        targets.append((f"oci_core_instance.amd_instance[{index}]", resource.id))
+    for index, resource in enumerate(existing_arm_instances.values()):
+        targets.append((f"oci_core_instance.arm_instance[{index}]", resource.id))
+
+    missing = [(address, ocid) for address, ocid in targets
+               if address not in in_state]
+    imports_path = Path("imports.tf")
+    if not missing:
+        # A stale import block for a resource already in state fails the plan.
+        try:
+            imports_path.unlink()
+        except FileNotFoundError:
+            pass
+        print_success("All existing resources already in Terraform state")
+        return True
+
+    # Import blocks (Terraform 1.5+) let the next plan/apply adopt every
+    # resource in one terraform run instead of one 'terraform import'
+    # subprocess per resource.
+    blocks = "".join(
+        f'import {{\n  to = {address}\n  id = "{ocid}"\n}}\n\n'
+        for address, ocid in missing)
+    _write_generated_file(
+        imports_path,
+        "# Generated by oci_terraform_setup - adopted resources; safe to\n"
+        "# delete once the apply has run.\n\n" + blocks,
+        time.strftime("%Y%m%d_%H%M%S"))
+
+    print_success(f"Queued {len(missing)} resources for import on next apply")
+    return True
+
+
+def _vcn_component_targets(vcn_id: str) -> List[Tuple[str, str]]:
+    """Addresses/OCIDs for the subnet/IGW/route table/security list of a VCN."""
+    component_map = [
+        (existing_subnets, "oci_core_subnet.free_tier_subnet"),
+        (existing_internet_gateways, "oci_core_internet_gateway.free_tier_igw"),
+        (existing_route_tables, "oci_core_route_table.free_tier_rt"),
+        (existing_security_lists, "oci_core_security_list.free_tier_sl"),
+    ]
+    targets = []
+    for resources, address in component_map:
+        for resource in resources.values():
+            if resource.additional_info.get("vcn_id") == vcn_id:
+                targets.append((address, resource.id))
+                break
+    return targets
+
+
+# ---------------------------------------------------------------------------
+# Terraform workflow
+# ---------------------------------------------------------------------------
+
+def run_terraform_workflow() -> bool:
+    """init -> validate -> plan -> (confirm) -> apply."""
+    print_header("Terraform Workflow")
+
+    # One shell invocation for the read-only steps; phase markers tell us
+    # which command failed without running three separate subprocesses.
+    print_status("Steps 1-3/5: terraform init / validate / plan")
+    script = (
+        "set -e; "
+        "echo @@PHASE=init; terraform init -input=false -upgrade; "
+        "echo @@PHASE=validate; terraform validate; "
+        "echo @@PHASE=plan; "
+        "terraform plan -out=tfplan -input=false "
+        f"-parallelism={get_settings().tf_parallelism}")
+    result = run_command(["bash", "-c", script])
+    if result.returncode != 0:
+        phase = "init"
+        for match in re.finditer(r"@@PHASE=(\w+)", result.stdout or ""):
+            phase = match.group(1)
+        print_error(f"terraform {phase} failed:")
+        console.print(result.stderr or result.stdout)
+        return False
+
+    print_status("Plan summary:")
+    # Fused stdout opens with the init/validate output; skip to the last
+    # phase marker so the peek reads plan lines, not provider installs.
+    import io
+    from itertools import islice
+
+    stdout = result.stdout or ""
+    marker = stdout.rfind("@@PHASE=plan")
+    plan_output = stdout[marker:] if marker >= 0 else stdout
+    for line in islice(io.StringIO(plan_output), 20):
+        if any(keyword in line for keyword in
+               ("will be created", "will be destroyed", "will be updated",
+                "Plan:", "No changes")):
+            console.print(f"  {line.strip()}")
+
+    print_status("Step 4/5: confirm")
+    if not get_settings().auto_deploy:
+        if not confirm_action("Apply this plan?", default=False):
+            print_status("Apply skipped")
+            return True
+
+    print_status("Step 5/5: terraform apply")
+    if not out_of_capacity_auto_apply():
+        return False
+
+    # With local state the outputs are right there in terraform.tfstate;
+    # only remote-backend runs need the extra terraform subprocess.
+    outputs = None
+    try:
+        outputs = _loads(Path("terraform.tfstate").read_text()).get("outputs")
+    except (OSError, ValueError):
+        pass
+    if outputs:
+        print_success("Outputs:")
+        console.print_json(json.dumps(outputs, indent=2))
+    else:
+        result = run_command(["terraform", "output"])
+        if result.returncode == 0 and result.stdout.strip():
+            print_success("Outputs:")
+            console.print(result.stdout)
+    return True
+
+
+def terraform_menu() -> None:
+    """Interactive Terraform operations menu."""
+    settings = get_settings()
+    if settings.auto_deploy or settings.non_interactive:
+        print_status("AUTO_DEPLOY=true - running the full workflow"
+                     if settings.auto_deploy
+                     else "Non-interactive mode - running the full workflow")
+        run_terraform_workflow()
+        return
+
+    while True:
+        print_header("Terraform Menu")
+        console.print("  1) Plan")
+        console.print("  2) Apply (with Out-of-Capacity retry)")
+        console.print("  3) Destroy")
+        console.print("  4) Show outputs")
+        console.print("  5) Show state")
+        console.print("  6) Import existing resources")
+        console.print("  7) Full workflow (init/validate/plan/apply)")
+        console.print("  8) Exit\n")
+        choice = IntPrompt.ask("Choose an option", default=7)
+
+        if choice == 1:
+            result = run_command([
+                "terraform", "plan",
+                f"-parallelism={get_settings().tf_parallelism}"])
+            console.print(result.stdout or result.stderr)
+        elif choice == 2:
+            out_of_capacity_auto_apply()
+        elif choice == 3:
+            if confirm_action("Really destroy all managed resources?",
+                              default=False):
+                result = run_command(["terraform", "destroy", "-auto-approve"])
+                console.print(result.stdout or result.stderr)
+        elif choice == 4:
+            result = run_command(["terraform", "output"])
+            console.print(result.stdout or result.stderr)
+        elif choice == 5:
+            # Independent reads; overlap the two terraform startups.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                state_future = executor.submit(
+                    run_command, ["terraform", "state", "list"])
+                output_future = executor.submit(
+                    run_command, ["terraform", "output"])
+            result = state_future.result()
+            console.print(result.stdout or result.stderr)
+            result = output_future.result()
+            console.print(result.stdout or result.stderr)
+        elif choice == 6:
+            import_existing_resources()
+        elif choice == 7:
+            run_terraform_workflow()
+        elif choice == 8:
+            return
+
+
+# ---------------------------------------------------------------------------
+# Main entry point
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    """Run the full setup workflow, phase by phase."""
+    print_header("OCI Always Free Tier Setup")
+
+    # Share downloaded providers across runs and working directories; a
+    # cold 'terraform init' otherwise re-fetches the ~100 MB OCI provider.
+    plugin_cache = Path.home() / ".terraform.d" / "plugin-cache"
+    plugin_cache.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("TF_PLUGIN_CACHE_DIR", str(plugin_cache))
+    os.environ.setdefault("TF_IN_AUTOMATION", "1")
+
+    # Phase 1: prerequisites
+    if not install_prerequisites():
+        return 1
+
+    # Phase 2: authentication
+    if not get_settings().skip_config:
+        if not setup_oci_config():
+            return 1
+    if not test_oci_connectivity():
+        return 1
+
+    # Phase 3: account details
+    if not fetch_oci_config_values():
+        return 1
+    # Phase 3/4 overlap: the AD and image lookups only need the config
+    # values fetched above, and key generation is purely local, so the
+    # three run concurrently (wall time = slowest, not the sum).
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        phase_futures = [executor.submit(fetch_availability_domains),
+                         executor.submit(fetch_ubuntu_images),
+                         executor.submit(generate_ssh_keys)]
+        if not all(future.result() for future in phase_futures):
+            return 1
+
+    # Phase 5: inventory
+    inventory_all_resources()
+    display_resource_inventory()
+    calculate_available_resources()
+
+    # Phase 6: configuration
+    if not load_existing_config():
+        if not prompt_configuration():
+            return 1
+    if not create_terraform_files():
+        return 1
+    if not configure_terraform_backend():
+        return 1
+
+    # Phase 7: Terraform
+    if existing_vcns or existing_amd_instances or existing_arm_instances:
+        import_existing_resources()
+    terraform_menu()
+
+    print_success("Setup complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Terraform workflow management for the quick-setup flow."""
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+class TerraformError(RuntimeError):
+    """A terraform operation exited non-zero.
+
+    Carries the raw fields so callers can inspect the exit code or
+    output structurally; the message is only formatted when the
+    exception is actually rendered.
+    """
+
+    __slots__ = ("op", "returncode", "stdout", "stderr")
+
+    def __init__(self, op: str, returncode: int,
+                 stdout: str = "", stderr: str = "") -> None:
+        super().__init__()
+        self.op = op
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def __str__(self) -> str:
+        detail = self.stderr or self.stdout
+        return f"terraform {self.op} failed (exit {self.returncode}): {detail}"
+
+
+class TerraformManager:
+    """Run Terraform operations in a working directory."""
+
+    def __init__(self, work_dir: str = ".", parallelism: int = 0) -> None:
+        self.work_dir = Path(work_dir).expanduser()
+        self.parallelism = parallelism
+        # Resolve the binary and snapshot the environment once so each
+        # invocation skips the PATH walk and the per-call environ copy.
+        self._tf = shutil.which("terraform") or "terraform"
+        self._env = os.environ.copy()
+
+    def _run(self, args: List[str], stream: bool = False,
+             text: bool = True) -> subprocess.CompletedProcess:
+        """Run terraform with *args*.
+
+        With ``stream=True`` output is echoed line by line as it arrives
+        and only a bounded tail is retained, so a multi-megabyte apply
+        log shows progress live instead of buffering silently in memory.
+        Quiet queries (``output -json``, ``state list``) keep the
+        capturing path since their stdout is parsed, not displayed.
+        """
+        cmd = [self._tf] + args
+        if not stream:
+            return subprocess.run(cmd, cwd=str(self.work_dir),
+                                  capture_output=True, text=text, check=False,
+                                  env=self._env)
+        proc = subprocess.Popen(cmd, cwd=str(self.work_dir),
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, bufsize=1,
+                                text=True, env=self._env)
+        tail: "deque[str]" = deque(maxlen=10_000)
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            print(line, end="", flush=True)
+            tail.append(line)
+        return subprocess.CompletedProcess(cmd, proc.wait(),
+                                           stdout="".join(tail), stderr="")
+
+    def init(self) -> None:
+        result = self._run(["init", "-upgrade"], stream=True)
+        if result.returncode != 0:
+            raise TerraformError("init", result.returncode,
+                                 stdout=result.stdout)
+
+    def validate(self) -> None:
+        result = self._run(["validate"], stream=True)
+        if result.returncode != 0:
+            raise TerraformError("validate", result.returncode,
+                                 stdout=result.stdout)
+
+    def plan(self) -> str:
+        args = ["plan", "-out=tfplan"]
+        if self.parallelism:
+            args.append(f"-parallelism={self.parallelism}")
+        result = self._run(args, stream=True)
+        if result.returncode != 0:
+            raise TerraformError("plan", result.returncode,
+                                 stdout=result.stdout)
+        return result.stdout
+
+    def apply(self, auto_approve: bool = True) -> str:
+        args = ["apply"]
+        if auto_approve:
+            args.append("-auto-approve")
+        if self.parallelism:
+            args.append(f"-parallelism={self.parallelism}")
+        if (self.work_dir / "tfplan").exists():
+            args.append("tfplan")
+        result = self._run(args, stream=True)
+        if result.returncode != 0:
+            raise TerraformError("apply", result.returncode,
+                                 stdout=result.stdout)
+        return result.stdout
+
+    def destroy(self) -> str:
+        result = self._run(["destroy", "-auto-approve"], stream=True)
+        if result.returncode != 0:
+            raise TerraformError("destroy", result.returncode,
+                                 stdout=result.stdout)
+        return result.stdout
+
+    async def _run_async(self, args: List[str]) -> subprocess.CompletedProcess:
+        proc = await asyncio.create_subprocess_exec(
+            self._tf, *args, cwd=str(self.work_dir),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            env=self._env)
+        stdout, stderr = await proc.communicate()
+        return subprocess.CompletedProcess(
+            [self._tf] + args, proc.returncode or 0,
+            stdout=stdout.decode(), stderr=stderr.decode())
+
+    async def init_async(self) -> None:
+        """Async ``init`` for overlapping with other independent work."""
+        result = await self._run_async(["init", "-upgrade"])
+        if result.returncode != 0:
+            raise TerraformError("init", result.returncode,
+                                 stderr=result.stderr)
+
+    async def plan_async(self) -> str:
+        """Async ``plan``; gather with ``output_async`` to overlap them."""
+        args = ["plan", "-out=tfplan"]
+        if self.parallelism:
+            args.append(f"-parallelism={self.parallelism}")
+        result = await self._run_async(args)
+        if result.returncode != 0:
+            raise TerraformError("plan", result.returncode,
+                                 stderr=result.stderr)
+        return result.stdout
+
+    async def output_async(self) -> Dict[str, Any]:
+        """Async variant of :meth:`output`."""
+        result = await self._run_async(["output", "-json"])
+        if result.returncode != 0:
+            return {}
+        try:
+            return json.loads(result.stdout)
+        except ValueError:
+            return {}
+
+    def output(self) -> Dict[str, Any]:
+        """Return the Terraform outputs as a dictionary."""
+        # json.loads takes bytes directly; decoding to str first would
+        # just add a UTF-8 pass over the whole payload.
+        result = self._run(["output", "-json"], text=False)
+        if result.returncode != 0:
+            return {}
+        try:
+            return json.loads(result.stdout)
+        except ValueError:
+            return {}
+
+    def state_list(self) -> List[str]:
+        """Return the resource addresses currently in state."""
+        result = self._run(["state", "list"])
+        if result.returncode != 0:
+            return []
+        return [line for line in result.stdout.splitlines() if line.strip()]